@@ -48,6 +48,8 @@ class LearnModeCVResult:
 class LearnModeHandTracker:
     """Hand tracking specifically for Learn Mode node manipulation"""
     
+    STATUS_EVERY_N_FRAMES = 150  # status_event fires once per this many processed frames
+    
     def __init__(self):
         # Initialize MediaPipe hands
         self.mp_hands = mp.solutions.hands
@@ -71,6 +73,7 @@ class LearnModeHandTracker:
         
         # Callback for streaming results
         self.result_callback: Optional[callable] = None
+        self.status_event: Optional[threading.Event] = None
         
         # Performance tracking
         self.frame_count = 0
@@ -78,8 +81,12 @@ class LearnModeHandTracker:
         
         print("✅ Learn Mode Hand Tracker initialized")
     
-    def start_camera(self, callback: callable) -> bool:
-        """Start camera and hand tracking with callback for results"""
+    def start_camera(self, callback: callable, status_event: Optional[threading.Event] = None) -> bool:
+        """Start camera and hand tracking with callback for results
+        
+        If status_event is given it is set every STATUS_EVERY_N_FRAMES frames,
+        so callers can wait for status updates instead of polling.
+        """
         try:
             # Initialize camera
             self.cap = cv2.VideoCapture(0)
@@ -94,6 +101,7 @@ class LearnModeHandTracker:
             
             # Set callback
             self.result_callback = callback
+            self.status_event = status_event
             
             # Start processing thread
             self.camera_active = True
@@ -155,6 +163,8 @@ class LearnModeHandTracker:
                 
                 # Performance tracking
                 self.frame_count += 1
+                if self.status_event is not None and self.frame_count % self.STATUS_EVERY_N_FRAMES == 0:
+                    self.status_event.set()
                 if self.frame_count % 100 == 0:
                     elapsed = time.time() - self.start_time
                     fps = self.frame_count / elapsed
@@ -15,7 +15,6 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from providers.sim import HardwareSimulator
-from schemas import ComponentStatus
 from gesture_recognition import GestureRecognizer, GestureResult
 from ml_predictor import FailurePredictionML
 
@@ -211,8 +210,8 @@ class MLEnhancedSynapseNet:
     def _update_score(self, telemetry):
         """Update resilience score based on system health and ML accuracy"""
         # Base scoring (same as before)
-        healthy_components = sum(1 for c in telemetry.components if c.status == ComponentStatus.HEALTHY)
-        healthy_links = sum(1 for l in telemetry.links if l.status == ComponentStatus.HEALTHY)
+        healthy_components = telemetry.system_metrics.get('healthy_components', 0)
+        healthy_links = telemetry.system_metrics.get('healthy_links', 0)
         
         total_components = len(telemetry.components)
         total_links = len(telemetry.links)
@@ -275,12 +274,9 @@ class MLEnhancedSynapseNet:
         bonus = 3 if ml_guided else 0
         self.score += (5 + bonus)
         
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            max_util_comp = max(latest_telemetry.components, key=lambda c: c.utilization)
-            if max_util_comp.utilization > 60:
-                max_util_comp.utilization *= 0.7
-                print(f"   Reduced load on {max_util_comp.name}")
+        comp = self.simulator.apply_cut()
+        if comp is not None:
+            print(f"   Reduced load on {comp.name}")
     
     def _action_heal(self, ml_guided=False):
         """Heal action with ML bonus"""
@@ -288,19 +284,11 @@ class MLEnhancedSynapseNet:
         bonus = 5 if ml_guided else 0
         self.score += (8 + bonus)
         
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            healed = False
-            for comp in latest_telemetry.components:
-                if comp.status != ComponentStatus.HEALTHY or comp.temperature > 70:
-                    comp.status = ComponentStatus.HEALTHY
-                    comp.temperature *= 0.8
-                    healed = True
-                    print(f"   Healed {comp.name}")
-                    break
-            
-            if not healed:
-                print("   No components need healing")
+        comp = self.simulator.apply_heal(max_temp=70)
+        if comp is not None:
+            print(f"   Healed {comp.name}")
+        else:
+            print("   No components need healing")
     
     def _action_reroute(self, ml_guided=False):
         """Reroute action with ML bonus"""
@@ -308,16 +296,12 @@ class MLEnhancedSynapseNet:
         bonus = 4 if ml_guided else 0
         self.score += (6 + bonus)
         
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            congested_links = [l for l in latest_telemetry.links if l.utilization > 70]
-            if congested_links:
-                for link in congested_links[:2]:
-                    link.utilization *= 0.6
-                    link.latency_ms *= 0.8
-                    print(f"   Rerouted traffic from {link.id}")
-            else:
-                print("   Network is running smoothly")
+        rerouted = self.simulator.apply_reroute(max_links=2)
+        if rerouted:
+            for link in rerouted:
+                print(f"   Rerouted traffic from {link.id}")
+        else:
+            print("   Network is running smoothly")
     
     def _action_shield(self, ml_guided=False):
         """Shield action with ML bonus"""
@@ -325,17 +309,8 @@ class MLEnhancedSynapseNet:
         bonus = 6 if ml_guided else 0
         self.score += (10 + bonus)
         
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            for comp in latest_telemetry.components:
-                comp.temperature *= 0.9
-                comp.utilization *= 0.95
-            
-            for link in latest_telemetry.links:
-                link.error_rate *= 0.5
-                link.utilization *= 0.9
-            
-            print("   System-wide resilience boosted!")
+        self.simulator.apply_shield()
+        print("   System-wide resilience boosted!")
     
     def _get_latest_telemetry(self):
         """Get latest telemetry data"""
@@ -431,7 +406,7 @@ class MLEnhancedSynapseNet:
         
         # System status
         if telemetry:
-            healthy_comps = sum(1 for c in telemetry.components if c.status == ComponentStatus.HEALTHY)
+            healthy_comps = telemetry.system_metrics.get('healthy_components', 0)
             total_comps = len(telemetry.components)
             cv2.putText(frame, f"Components: {healthy_comps}/{total_comps}", (20, 310), font, 0.5, (255, 255, 255), 1)
             
@@ -12,6 +12,9 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 import time
 
+# Single-file model bundle written by train_models.py; older model dirs hold one .pkl per artifact
+MODEL_BUNDLE = "models.joblib"
+
 
 @dataclass
 class FailurePrediction:
@@ -50,6 +53,11 @@ class FailurePredictionML:
         """Load all trained models and supporting files"""
         print(f"📂 Loading ML models from {self.models_dir}...")
         
+        bundle_path = os.path.join(self.models_dir, MODEL_BUNDLE)
+        if os.path.exists(bundle_path):
+            self.load_bundle(bundle_path)
+            return
+        
         try:
             # Load binary classifier
             binary_model_path = os.path.join(self.models_dir, "failure_predictor.pkl")
@@ -57,7 +65,9 @@ class FailurePredictionML:
             
             if os.path.exists(binary_model_path):
                 self.models['binary'] = joblib.load(binary_model_path)
-                self.scalers['binary'] = joblib.load(binary_scaler_path)
+                # Older models were trained on scaled features; newer ones ship without a scaler
+                if os.path.exists(binary_scaler_path):
+                    self.scalers['binary'] = joblib.load(binary_scaler_path)
                 print("   ✅ Binary failure predictor loaded")
             
             # Load multiclass classifier
@@ -66,7 +76,8 @@ class FailurePredictionML:
             
             if os.path.exists(multi_model_path):
                 self.models['multiclass'] = joblib.load(multi_model_path)
-                self.scalers['multiclass'] = joblib.load(multi_scaler_path)
+                if os.path.exists(multi_scaler_path):
+                    self.scalers['multiclass'] = joblib.load(multi_scaler_path)
                 print("   ✅ Multiclass failure type predictor loaded")
             
             # Load failure type mapping
@@ -85,6 +96,26 @@ class FailurePredictionML:
             print(f"❌ Error loading models: {e}")
             raise
     
+    def load_bundle(self, bundle_path: str):
+        """Load the single-file bundle written by train_models.py"""
+        try:
+            bundle = joblib.load(bundle_path)
+        except Exception as e:
+            print(f"❌ Error loading models: {e}")
+            raise
+        
+        for name, key in (("failure_predictor", "binary"), ("failure_type_predictor", "multiclass")):
+            if name in bundle['models']:
+                self.models[key] = bundle['models'][name]
+                if name in bundle['scalers']:
+                    self.scalers[key] = bundle['scalers'][name]
+        self.failure_type_mapping = bundle['type_mapping']
+        self.feature_names = bundle['feature_names']
+        
+        print(f"   ✅ Loaded {', '.join(self.models)} predictors from {bundle_path}")
+        print(f"   ✅ Failure type mapping loaded: {self.failure_type_mapping}")
+        print(f"   ✅ Feature names loaded: {len(self.feature_names)} features")
+    
     def extract_features_from_telemetry(self, telemetry_frame) -> Optional[np.array]:
         """Extract ML features from current telemetry frame"""
         
@@ -168,9 +199,9 @@ class FailurePredictionML:
             # Binary prediction: Will any failure occur?
             if 'binary' in self.models:
                 binary_model = self.models['binary']
-                binary_scaler = self.scalers['binary']
+                binary_scaler = self.scalers.get('binary')
                 
-                features_scaled = binary_scaler.transform(features)
+                features_scaled = binary_scaler.transform(features) if binary_scaler is not None else features
                 failure_probability = binary_model.predict_proba(features_scaled)[0][1]
                 
                 if failure_probability > self.binary_threshold:
@@ -180,9 +211,9 @@ class FailurePredictionML:
                     
                     if 'multiclass' in self.models and len(self.failure_type_mapping) > 0:
                         multi_model = self.models['multiclass']
-                        multi_scaler = self.scalers['multiclass']
+                        multi_scaler = self.scalers.get('multiclass')
                         
-                        multi_features_scaled = multi_scaler.transform(features)
+                        multi_features_scaled = multi_scaler.transform(features) if multi_scaler is not None else features
                         type_prediction = multi_model.predict(multi_features_scaled)[0]
                         type_probabilities = multi_model.predict_proba(multi_features_scaled)[0]
                         
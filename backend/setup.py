@@ -10,7 +10,7 @@ setup(
     description="Interactive 3D Hardware Atlas & Chaos Survival Challenge - Backend",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
-    python_requires=">=3.9",
+    python_requires=">=3.10",
     install_requires=[
         "pydantic>=2.0.0",
         "numpy>=1.24.0", 
@@ -21,6 +21,9 @@ setup(
         "orjson>=3.9.0",
     ],
     extras_require={
+        "jit": [
+            "numba>=0.58.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
@@ -5,9 +5,11 @@ Tracks system health, user performance, and provides educational insights
 for both Learning Mode and Chaos Mode gameplay.
 """
 
+import heapq
 import time
+from collections import deque
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import sys
@@ -34,7 +36,15 @@ class ActionEvent:
     response_time: float = 0.0  # seconds from problem to action
 
 
-@dataclass
+class MetricsSnapshot(NamedTuple):
+    """Point-in-time copy of the headline metrics"""
+    resilience_score: float
+    avg_latency: float
+    uptime_percentage: float
+    efficiency_score: float
+
+
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Real-time system performance metrics"""
     # Core metrics
@@ -65,6 +75,11 @@ class PerformanceMetrics:
     session_start: float = field(default_factory=time.time)
     total_uptime: float = 0.0
     total_downtime: float = 0.0
+    
+    def snapshot(self) -> MetricsSnapshot:
+        """Headline metrics as an immutable tuple - the dataclass itself is updated in place"""
+        return MetricsSnapshot(self.resilience_score, self.avg_latency,
+                               self.uptime_percentage, self.efficiency_score)
 
 
 @dataclass
@@ -76,6 +91,31 @@ class InsightMessage:
     timestamp: float = field(default_factory=time.time)
 
 
+@dataclass(slots=True)
+class _ActiveLinks:
+    """Columns of the healthy links, gathered once per update and shared by the link metrics"""
+    latency: np.ndarray
+    bandwidth: np.ndarray
+    utilization: np.ndarray
+    error_rate: np.ndarray
+    is_retimed: np.ndarray  # PCIe/CXL links that sit behind retimers
+    is_cxl: np.ndarray
+    
+    @classmethod
+    def from_telemetry(cls, telemetry: TelemetryFrame) -> "_ActiveLinks":
+        links = [link for link in telemetry.links if link.status == ComponentStatus.HEALTHY]
+        n = len(links)
+        link_types = [link.link_type.value for link in links]
+        return cls(
+            latency=np.fromiter((link.latency_ms for link in links), dtype=np.float64, count=n),
+            bandwidth=np.fromiter((link.bandwidth_gbps for link in links), dtype=np.float64, count=n),
+            utilization=np.fromiter((link.utilization for link in links), dtype=np.float64, count=n),
+            error_rate=np.fromiter((link.error_rate for link in links), dtype=np.float64, count=n),
+            is_retimed=np.fromiter((t in ("pcie", "cxl") for t in link_types), dtype=bool, count=n),
+            is_cxl=np.fromiter((t == "cxl" for t in link_types), dtype=bool, count=n)
+        )
+
+
 class KPIScorecard:
     """
     Comprehensive scoring and metrics system for SynapseNet
@@ -84,9 +124,10 @@ class KPIScorecard:
     scoring for both educational and competitive gameplay modes.
     """
     
-    def __init__(self, mode: GameMode = GameMode.CHAOS):
+    def __init__(self, mode: GameMode = GameMode.CHAOS, clock: Callable[[], float] = time.time):
         self.mode = mode
-        self.metrics = PerformanceMetrics()
+        self.clock = clock  # Time source; time.monotonic avoids wall-clock steps, tests inject a simulated clock
+        self.metrics = PerformanceMetrics(session_start=clock())
         self.action_history: List[ActionEvent] = []
         self.insights: List[InsightMessage] = []
         self.baseline_metrics: Dict[str, float] = {}
@@ -95,9 +136,9 @@ class KPIScorecard:
         self.failure_events: List[Tuple[float, str, str]] = []  # (timestamp, component, type)
         self.recovery_events: List[Tuple[float, str, float]] = []  # (timestamp, component, duration)
         
-        # Performance history for trends
-        self.performance_history: List[Tuple[float, Dict[str, float]]] = []
+        # Performance history for trends (bounded - oldest snapshots drop off in O(1))
         self.max_history_size = 1000
+        self.performance_history: Deque[Tuple[float, Dict[str, float]]] = deque(maxlen=self.max_history_size)
         
         # Scoring weights (can be tuned)
         self.scoring_weights = {
@@ -109,19 +150,21 @@ class KPIScorecard:
         
     def update_system_state(self, system_state: SystemState) -> None:
         """Update metrics based on current system state"""
-        current_time = time.time()
+        current_time = self.clock()
+        telemetry = system_state.telemetry
+        active = _ActiveLinks.from_telemetry(telemetry)  # one pass over the links for every link metric
         
         # Calculate core metrics
-        self._calculate_resilience(system_state.telemetry)
-        self._calculate_latency_bandwidth(system_state.telemetry)
-        self._calculate_uptime(system_state.telemetry, current_time)
-        self._detect_failures(system_state.telemetry, current_time)
+        self._calculate_resilience(telemetry, active)
+        self._calculate_latency_bandwidth(telemetry, active)
+        self._calculate_uptime(telemetry, current_time)
+        self._detect_failures(telemetry, current_time)
         
         # Calculate Astera Labs connectivity metrics
-        self._calculate_signal_integrity(system_state.telemetry)
-        self._calculate_retimer_compensation(system_state.telemetry)
-        self._calculate_smart_cable_health(system_state.telemetry)
-        self._calculate_cxl_utilization(system_state.telemetry)
+        self._calculate_signal_integrity(telemetry, active)
+        self._calculate_retimer_compensation(telemetry, active)
+        self._calculate_smart_cable_health(telemetry)
+        self._calculate_cxl_utilization(active)
         
         # Store performance snapshot
         snapshot = {
@@ -136,22 +179,22 @@ class KPIScorecard:
             "cxl_utilization": self.metrics.cxl_channel_utilization
         }
         self.performance_history.append((current_time, snapshot))
-        
-        # Trim history if too long
-        if len(self.performance_history) > self.max_history_size:
-            self.performance_history.pop(0)
             
         # Generate insights based on trends
         self._generate_insights(system_state.telemetry)
     
     def record_user_action(self, action_type: str, target_component: Optional[str] = None,
                           problem_start_time: Optional[float] = None) -> ActionEvent:
-        """Record a user action and calculate its effectiveness"""
-        current_time = time.time()
+        """Record a user action and calculate its effectiveness
+        
+        problem_start_time must come from the scorecard's clock.
+        """
+        current_time = self.clock()
         
-        # Calculate response time if problem start time provided
+        # Calculate response time if problem start time provided (0.0 is a valid
+        # reading for monotonic or simulated clocks)
         response_time = 0.0
-        if problem_start_time:
+        if problem_start_time is not None:
             response_time = current_time - problem_start_time
             
         # Calculate effectiveness based on system state improvement
@@ -207,11 +250,16 @@ class KPIScorecard:
     
     def get_recent_insights(self, count: int = 5) -> List[InsightMessage]:
         """Get most recent insights"""
-        return sorted(self.insights, key=lambda x: x.timestamp, reverse=True)[:count]
+        # Same order as sorted(..., reverse=True)[:count] without sorting the whole history
+        return heapq.nlargest(count, self.insights, key=lambda x: x.timestamp)
+    
+    def get_recent_insight_messages(self, count: int = 5) -> List[str]:
+        """Get the message text of the most recent insights"""
+        return [insight.message for insight in self.get_recent_insights(count)]
     
     def get_performance_trend(self, metric: str, duration_seconds: int = 60) -> List[Tuple[float, float]]:
         """Get performance trend for a specific metric over time"""
-        current_time = time.time()
+        current_time = self.clock()
         cutoff_time = current_time - duration_seconds
         
         trend_data = []
@@ -223,7 +271,7 @@ class KPIScorecard:
     
     def generate_session_summary(self) -> Dict:
         """Generate comprehensive session summary"""
-        session_duration = time.time() - self.metrics.session_start
+        session_duration = self.clock() - self.metrics.session_start
         
         summary = {
             "session_duration": session_duration,
@@ -258,26 +306,29 @@ class KPIScorecard:
         
         return summary
     
-    def _calculate_resilience(self, telemetry: TelemetryFrame) -> None:
+    def _calculate_resilience(self, telemetry: TelemetryFrame, active: _ActiveLinks) -> None:
         """Calculate system resilience score (0-100)"""
-        total_components = len(telemetry.components)
+        components = telemetry.components
+        total_components = len(components)
         if total_components == 0:
             self.metrics.resilience_score = 0.0
             return
             
-        # Count healthy vs degraded/failed components + factor in utilization/temperature stress
-        healthy_score = 0
-        for comp in telemetry.components:
-            if comp.status == ComponentStatus.HEALTHY:
-                # Reduce score for high utilization and temperature (CHAOS SENSITIVE)
-                util_penalty = max(0, (comp.utilization - 80) * 0.02)  # Penalty above 80%
-                temp_penalty = max(0, (comp.temperature - 70) * 0.01)  # Penalty above 70°C
-                component_score = max(0.1, 1.0 - util_penalty - temp_penalty)  # Min 0.1 for healthy
-                healthy_score += component_score
-            elif comp.status == ComponentStatus.DEGRADED:
-                healthy_score += 0.3  # Reduced from 0.5 - degraded is worse now
-            elif comp.status == ComponentStatus.FAILED:
-                healthy_score += 0.0
+        # Component columns - one pass over the models, then whole-array math
+        n = total_components
+        status = [comp.status for comp in components]
+        healthy = np.fromiter((st == ComponentStatus.HEALTHY for st in status), dtype=bool, count=n)
+        degraded = np.fromiter((st == ComponentStatus.DEGRADED for st in status), dtype=bool, count=n)
+        utilization = np.fromiter((comp.utilization for comp in components), dtype=np.float64, count=n)
+        temperature = np.fromiter((comp.temperature for comp in components), dtype=np.float64, count=n)
+        
+        # Healthy components lose score for high utilization and temperature (CHAOS SENSITIVE)
+        util_penalty = np.maximum(0, (utilization - 80) * 0.02)  # Penalty above 80%
+        temp_penalty = np.maximum(0, (temperature - 70) * 0.01)  # Penalty above 70°C
+        component_score = np.maximum(0.1, 1.0 - util_penalty - temp_penalty)  # Min 0.1 for healthy
+        
+        # Degraded counts 0.3 (reduced from 0.5 - degraded is worse now), failed counts nothing
+        healthy_score = float(component_score[healthy].sum()) + 0.3 * int(degraded.sum())
         
         # Calculate weighted resilience
         resilience = healthy_score / total_components
@@ -286,14 +337,12 @@ class KPIScorecard:
         # Factor in link health
         total_links = len(telemetry.links)
         if total_links > 0:
-            healthy_links = sum(1 for link in telemetry.links 
-                              if link.status == ComponentStatus.HEALTHY)
-            link_health = healthy_links / total_links
+            link_health = active.latency.shape[0] / total_links
             
             # Combine component and link health (70% components, 30% links)
             self.metrics.resilience_score = (resilience * 0.7 + link_health * 0.3) * 100
     
-    def _calculate_latency_bandwidth(self, telemetry: TelemetryFrame) -> None:
+    def _calculate_latency_bandwidth(self, telemetry: TelemetryFrame, active: _ActiveLinks) -> None:
         """Calculate average latency and total bandwidth"""
         if not telemetry.links:
             self.metrics.avg_latency = 0.0
@@ -301,20 +350,19 @@ class KPIScorecard:
             return
             
         # Calculate average latency across active links
-        active_links = [link for link in telemetry.links if link.status == ComponentStatus.HEALTHY]
-        if active_links:
-            total_latency = sum(link.latency_ms for link in active_links)
-            self.metrics.avg_latency = total_latency / len(active_links)
+        n_active = active.latency.shape[0]
+        if n_active:
+            self.metrics.avg_latency = float(active.latency.sum()) / n_active
             
             # Calculate total available bandwidth
-            self.metrics.total_bandwidth = sum(link.bandwidth_gbps for link in active_links)
+            self.metrics.total_bandwidth = float(active.bandwidth.sum())
         else:
             self.metrics.avg_latency = float('inf')  # No active links
             self.metrics.total_bandwidth = 0.0
             
         # Calculate efficiency score based on utilization
-        if active_links:
-            avg_utilization = sum(link.utilization for link in active_links) / len(active_links)
+        if n_active:
+            avg_utilization = float(active.utilization.sum()) / n_active
             # Efficiency is high when utilization is moderate (not too low, not maxed out)
             optimal_utilization = 0.7
             efficiency = 1.0 - abs(avg_utilization - optimal_utilization) / optimal_utilization
@@ -447,7 +495,7 @@ class KPIScorecard:
     
     def _generate_insights(self, telemetry: TelemetryFrame) -> None:
         """Generate educational and performance insights"""
-        current_time = time.time()
+        current_time = self.clock()
         
         # Don't generate insights too frequently
         recent_insights = [i for i in self.insights if current_time - i.timestamp < 10.0]
@@ -458,37 +506,37 @@ class KPIScorecard:
         if self.metrics.resilience_score < 30:
             self.insights.append(InsightMessage(
                 "🚨 Critical: System resilience below 30%! Multiple components need attention.",
-                "warning", 3
+                "warning", 3, current_time
             ))
         elif self.metrics.resilience_score < 60:
             self.insights.append(InsightMessage(
                 "⚠️ System resilience declining. Consider healing degraded components.",
-                "tip", 2
+                "tip", 2, current_time
             ))
             
         # Latency insights
         if self.metrics.avg_latency > 50:
             self.insights.append(InsightMessage(
                 "🐌 High latency detected. Try rerouting traffic or healing network links.",
-                "tip", 2
+                "tip", 2, current_time
             ))
             
         # Performance insights for Learning Mode
         if self.mode == GameMode.LEARNING:
             if len(self.performance_history) > 10:
                 # Analyze trends
-                recent_resilience = [p[1]["resilience"] for p in self.performance_history[-10:]]
+                recent_resilience = [self.performance_history[i][1]["resilience"] for i in range(-10, 0)]
                 if len(recent_resilience) > 1:
                     trend = recent_resilience[-1] - recent_resilience[0]
                     if trend > 10:
                         self.insights.append(InsightMessage(
                             "📈 Great! Your changes improved system resilience by {:.1f}%".format(trend),
-                            "success", 1
+                            "success", 1, current_time
                         ))
                     elif trend < -10:
                         self.insights.append(InsightMessage(
                             "📉 Your recent changes decreased resilience. Try a different approach.",
-                            "info", 1
+                            "info", 1, current_time
                         ))
     
     def _generate_action_feedback(self, action: ActionEvent, score_bonus: int) -> None:
@@ -507,70 +555,43 @@ class KPIScorecard:
         if action.response_time > 0 and action.response_time <= 2.0:
             feedback += f" (Fast response: {action.response_time:.1f}s!)"
             
-        self.insights.append(InsightMessage(feedback, "success", 1))
+        self.insights.append(InsightMessage(feedback, "success", 1, action.timestamp))
     
-    def _calculate_signal_integrity(self, telemetry: TelemetryFrame) -> None:
+    def _calculate_signal_integrity(self, telemetry: TelemetryFrame, active: _ActiveLinks) -> None:
         """Calculate overall signal integrity score based on link quality"""
         if not telemetry.links:
             self.metrics.signal_integrity_score = 100.0
             return
             
-        total_score = 0.0
-        active_links = [link for link in telemetry.links if link.status == ComponentStatus.HEALTHY]
-        
-        if not active_links:
+        if not active.latency.shape[0]:
             self.metrics.signal_integrity_score = 0.0
             return
             
-        for link in active_links:
-            # MUCH MORE SENSITIVE TO CHAOS - Signal quality degrades dramatically
-            latency_penalty = min(80, link.latency_ms * 15)  # Up to 80% penalty for high latency (3x more sensitive)
-            utilization_penalty = max(0, (link.utilization - 60) * 4)  # Penalty above 60% util (2x more sensitive)
-            error_penalty = link.error_rate * 25  # 25% penalty per 1% error rate (2.5x more sensitive)
-            
-            # Extra penalty for degraded status
-            status_penalty = 0
-            if link.status == ComponentStatus.DEGRADED:
-                status_penalty = 40  # Big penalty for degraded links
-            elif link.status == ComponentStatus.FAILED:
-                status_penalty = 100  # Complete penalty for failed links
-            
-            link_score = max(0, 100 - latency_penalty - utilization_penalty - error_penalty - status_penalty)
-            total_score += link_score
-            
-        self.metrics.signal_integrity_score = total_score / len(active_links)
+        # MUCH MORE SENSITIVE TO CHAOS - Signal quality degrades dramatically
+        latency_penalty = np.minimum(80, active.latency * 15)  # Up to 80% penalty for high latency (3x more sensitive)
+        utilization_penalty = np.maximum(0, (active.utilization - 60) * 4)  # Penalty above 60% util (2x more sensitive)
+        error_penalty = active.error_rate * 25  # 25% penalty per 1% error rate (2.5x more sensitive)
+        
+        # Only healthy links are scored, so no degraded/failed status penalty applies
+        link_score = np.maximum(0, 100 - latency_penalty - utilization_penalty - error_penalty)
+        self.metrics.signal_integrity_score = float(link_score.mean())
     
-    def _calculate_retimer_compensation(self, telemetry: TelemetryFrame) -> None:
+    def _calculate_retimer_compensation(self, telemetry: TelemetryFrame, active: _ActiveLinks) -> None:
         """Calculate how much retimer compensation is needed"""
-        if not telemetry.links:
+        if not telemetry.links or not active.is_retimed.any():
             self.metrics.retimer_compensation_level = 0.0
             return
             
-        total_compensation = 0.0
-        pcie_links = [link for link in telemetry.links 
-                     if link.link_type.value in ["pcie", "cxl"] and 
-                     link.status == ComponentStatus.HEALTHY]
+        latency = active.latency[active.is_retimed]
+        error_rate = active.error_rate[active.is_retimed]
         
-        if not pcie_links:
-            self.metrics.retimer_compensation_level = 0.0
-            return
-            
-        for link in pcie_links:
-            # DRAMATIC compensation for chaos - much more sensitive
-            distance_compensation = min(100, link.latency_ms * 50)  # Up to 100% for high latency (2.5x more sensitive)
-            error_compensation = min(50, link.error_rate * 10)  # Up to 50% for errors (2.5x more sensitive)
-            
-            # Status penalty - FAILED/DEGRADED links need MAXIMUM compensation
-            status_penalty = 0
-            if link.status == ComponentStatus.FAILED:
-                status_penalty = 100  # MAXIMUM compensation for failed links
-            elif link.status == ComponentStatus.DEGRADED:
-                status_penalty = 50   # HIGH compensation for degraded links
-            
-            link_compensation = distance_compensation + error_compensation + status_penalty
-            total_compensation += link_compensation
-            
-        self.metrics.retimer_compensation_level = min(100, total_compensation / len(pcie_links))
+        # DRAMATIC compensation for chaos - much more sensitive
+        distance_compensation = np.minimum(100, latency * 50)  # Up to 100% for high latency (2.5x more sensitive)
+        error_compensation = np.minimum(50, error_rate * 10)  # Up to 50% for errors (2.5x more sensitive)
+        
+        # Only healthy links are considered, so no FAILED/DEGRADED status penalty applies
+        link_compensation = distance_compensation + error_compensation
+        self.metrics.retimer_compensation_level = min(100, float(link_compensation.mean()))
     
     def _calculate_smart_cable_health(self, telemetry: TelemetryFrame) -> None:
         """Calculate smart cable module health"""
@@ -607,16 +628,11 @@ class KPIScorecard:
             
         self.metrics.smart_cable_health = total_health / len(gpu_links)
     
-    def _calculate_cxl_utilization(self, telemetry: TelemetryFrame) -> None:
+    def _calculate_cxl_utilization(self, active: _ActiveLinks) -> None:
         """Calculate CXL memory channel utilization"""
-        cxl_links = [link for link in telemetry.links 
-                    if link.link_type.value == "cxl" and 
-                    link.status == ComponentStatus.HEALTHY]
-        
-        if not cxl_links:
+        if not active.is_cxl.any():
             self.metrics.cxl_channel_utilization = 0.0
             return
             
         # Average utilization across all CXL channels
-        total_utilization = sum(link.utilization for link in cxl_links)
-        self.metrics.cxl_channel_utilization = total_utilization / len(cxl_links)
+        self.metrics.cxl_channel_utilization = float(active.utilization[active.is_cxl].mean())
@@ -0,0 +1,102 @@
+"""
+Numeric kernels for route discovery.
+The topology is flattened into CSR adjacency arrays (integer node indices) so
+path enumeration runs without Python objects. Compiled with Numba when it is
+installed, otherwise runs as plain Python.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional - fall back to plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def find_all_routes(indptr, neighbors, edge_lat, edge_bw, edge_util, edge_valid,
+                    source, target, max_hops, max_latency=np.inf, min_bandwidth=0.0):
+    """
+    Enumerate simple paths from source to target with at most max_hops hops.
+
+    Depth-first, visiting neighbors in adjacency order. Edges with
+    edge_valid == 0 are skipped. Branches are pruned as soon as their
+    accumulated latency exceeds max_latency or their bottleneck bandwidth
+    drops below min_bandwidth - both only get worse as a path grows, so no
+    qualifying route is lost. Returns (paths_flat, path_lens, total_latency,
+    min_bandwidth, max_utilization), one entry per route in discovery order;
+    paths_flat holds the node indices of every route back to back.
+    """
+    n_nodes = indptr.shape[0] - 1
+    max_len = max_hops + 1
+
+    visited = np.zeros(n_nodes, dtype=np.bool_)
+    path = np.empty(max_len, dtype=np.int64)
+    next_edge = np.empty(max_len, dtype=np.int64)
+    lat = np.empty(max_len, dtype=np.float64)
+    bw = np.empty(max_len, dtype=np.float64)
+    util = np.empty(max_len, dtype=np.float64)
+
+    paths_flat = []
+    path_lens = []
+    route_lat = []
+    route_bw = []
+    route_util = []
+
+    # Start at the source with an empty route
+    path[0] = source
+    next_edge[0] = indptr[source]
+    lat[0] = 0.0
+    bw[0] = np.inf
+    util[0] = 0.0
+    visited[source] = True
+    depth = 0
+
+    while depth >= 0:
+        node = path[depth]
+        e = next_edge[depth]
+        if e == indptr[node + 1]:
+            # Exhausted this node's neighbors - backtrack
+            visited[node] = False
+            depth -= 1
+            continue
+        next_edge[depth] = e + 1
+
+        nb = neighbors[e]
+        if visited[nb] or edge_valid[e] == 0 or depth + 1 >= max_len:
+            continue
+
+        new_lat = lat[depth] + edge_lat[e]
+        new_bw = min(bw[depth], edge_bw[e])
+        new_util = max(util[depth], edge_util[e])
+        if new_lat > max_latency or new_bw < min_bandwidth:
+            continue
+
+        if nb == target:
+            # Found a route!
+            for i in range(depth + 1):
+                paths_flat.append(path[i])
+            paths_flat.append(nb)
+            path_lens.append(depth + 2)
+            route_lat.append(new_lat)
+            route_bw.append(new_bw)
+            route_util.append(new_util)
+            continue
+
+        depth += 1
+        path[depth] = nb
+        next_edge[depth] = indptr[nb]
+        lat[depth] = new_lat
+        bw[depth] = new_bw
+        util[depth] = new_util
+        visited[nb] = True
+
+    return (np.array(paths_flat, dtype=np.int64), np.array(path_lens, dtype=np.int64),
+            np.array(route_lat, dtype=np.float64), np.array(route_bw, dtype=np.float64),
+            np.array(route_util, dtype=np.float64))
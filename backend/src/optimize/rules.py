@@ -7,6 +7,7 @@ when network links fail or become congested.
 
 import time
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from enum import Enum
@@ -17,6 +18,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from schemas import TelemetryFrame, HardwareComponent, Link, ComponentStatus, LinkType
+from optimize.route_kernels import find_all_routes as _find_all_routes_kernel
+
+
+# Integer status codes used by the array-based analysis
+_STATUS_CODE = {
+    ComponentStatus.HEALTHY: 0,
+    ComponentStatus.DEGRADED: 1,
+    ComponentStatus.FAILED: 2,
+    ComponentStatus.OFFLINE: 3
+}
 
 
 class RouteQuality(Enum):
@@ -27,7 +38,7 @@ class RouteQuality(Enum):
     FAILED = "failed"       # Link down or component failed
 
 
-@dataclass
+@dataclass(slots=True)
 class Route:
     """A network route between two components"""
     source_id: str
@@ -43,7 +54,7 @@ class Route:
         self.hops = len(self.path) - 1
 
 
-@dataclass
+@dataclass(slots=True)
 class RerouteAction:
     """An action to reroute traffic"""
     timestamp: float
@@ -55,6 +66,25 @@ class RerouteAction:
     expected_improvement: Dict[str, float]  # latency, bandwidth, etc.
 
 
+@dataclass(slots=True)
+class LinkTable:
+    """Struct-of-arrays view of a link list for vectorized analysis"""
+    latency_ms: np.ndarray
+    bandwidth_gbps: np.ndarray
+    utilization: np.ndarray
+    status: np.ndarray  # int8 codes from _STATUS_CODE
+    
+    @classmethod
+    def from_links(cls, links: List[Link]) -> "LinkTable":
+        n = len(links)
+        return cls(
+            latency_ms=np.fromiter((l.latency_ms for l in links), dtype=np.float64, count=n),
+            bandwidth_gbps=np.fromiter((l.bandwidth_gbps for l in links), dtype=np.float64, count=n),
+            utilization=np.fromiter((l.utilization for l in links), dtype=np.float64, count=n),
+            status=np.fromiter((_STATUS_CODE[l.status] for l in links), dtype=np.int8, count=n)
+        )
+
+
 class IntelligentRouter:
     """
     Rules-based intelligent routing system
@@ -65,7 +95,13 @@ class IntelligentRouter:
     
     def __init__(self):
         self.topology_cache: Dict[str, Dict[str, List[str]]] = {}
-        self.route_cache: Dict[Tuple[str, str], List[Route]] = {}
+        self._topology_version = 0  # Bumped whenever the adjacency changes
+        self._route_graph_key: Optional[Tuple[int, tuple]] = None
+        self._route_graph = None  # (node_ids, node_index, CSR arrays) for _route_graph_key
+        # LRU of discovered routes keyed by (source, target, bounds, links fingerprint)
+        self.route_cache: "OrderedDict[Tuple[str, str, float, float, int], List[Route]]" = OrderedDict()
+        self.route_cache_size = 256
+        self.route_cache_max_links = 512  # Don't memoize very large networks
         self.active_routes: Dict[Tuple[str, str], Route] = {}
         self.reroute_history: List[RerouteAction] = []
         
@@ -85,87 +121,86 @@ class IntelligentRouter:
     def update_topology(self, telemetry: TelemetryFrame) -> None:
         """Update network topology from telemetry data"""
         # Build adjacency list representation
-        self.topology_cache.clear()
+        topology: Dict[str, Dict[str, List[str]]] = {}
         
         # Initialize all components
         for component in telemetry.components:
-            self.topology_cache[component.id] = {}
+            topology[component.id] = {}
             
         # Add links to topology
         for link in telemetry.links:
             if link.status == ComponentStatus.HEALTHY:
                 # Bidirectional links
-                if link.target_id not in self.topology_cache[link.source_id]:
-                    self.topology_cache[link.source_id][link.target_id] = []
-                if link.source_id not in self.topology_cache[link.target_id]:
-                    self.topology_cache[link.target_id][link.source_id] = []
+                if link.target_id not in topology[link.source_id]:
+                    topology[link.source_id][link.target_id] = []
+                if link.source_id not in topology[link.target_id]:
+                    topology[link.target_id][link.source_id] = []
                     
                 # Store link info for routing decisions
-                self.topology_cache[link.source_id][link.target_id].append(link.id)
-                self.topology_cache[link.target_id][link.source_id].append(link.id)
+                topology[link.source_id][link.target_id].append(link.id)
+                topology[link.target_id][link.source_id].append(link.id)
+        
+        # Cached routes are only valid for the graph they were found on
+        if topology != self.topology_cache:
+            self.route_cache.clear()
+            self._topology_version += 1
+        self.topology_cache = topology
     
     def find_all_routes(self, source_id: str, target_id: str, 
-                       telemetry: TelemetryFrame) -> List[Route]:
-        """Find all possible routes between two components"""
-        if (source_id, target_id) in self.route_cache:
-            return self.route_cache[(source_id, target_id)]
+                       telemetry: TelemetryFrame, max_latency: Optional[float] = None,
+                       min_bandwidth: Optional[float] = None) -> List[Route]:
+        """
+        Find all possible routes between two components
+        
+        Optional max_latency / min_bandwidth bounds restrict the result to
+        routes within them and prune the search early.
+        """
+        max_latency = float('inf') if max_latency is None else float(max_latency)
+        min_bandwidth = 0.0 if min_bandwidth is None else float(min_bandwidth)
+        
+        cache_key = None
+        fingerprint = None
+        if len(telemetry.links) <= self.route_cache_max_links:
+            fingerprint = self._links_fingerprint(telemetry)
+            cache_key = (source_id, target_id, max_latency, min_bandwidth, fingerprint)
+            cached = self.route_cache.get(cache_key)
+            if cached is not None:
+                self.route_cache.move_to_end(cache_key)
+                return cached
             
         routes = []
-        visited = set()
+        node_ids, node_index, graph = self._get_route_graph(telemetry)
         
-        def dfs_routes(current: str, target: str, path: List[str], 
-                      total_latency: float, min_bandwidth: float, max_util: float):
-            if len(path) > self.max_hops + 1:  # Too many hops
-                return
-                
-            if current == target and len(path) > 1:
-                # Found a route!
-                quality = self._assess_route_quality(total_latency, min_bandwidth, max_util)
-                route = Route(
+        if source_id in node_index and target_id in node_index:
+            paths_flat, path_lens, latencies, bandwidths, utilizations = _find_all_routes_kernel(
+                *graph, node_index[source_id], node_index[target_id], self.max_hops,
+                max_latency, min_bandwidth
+            )
+            
+            # Convert integer paths back to component IDs
+            start = 0
+            for length, latency, bandwidth, util in zip(path_lens.tolist(), latencies.tolist(),
+                                                        bandwidths.tolist(), utilizations.tolist()):
+                path = [node_ids[i] for i in paths_flat[start:start + length].tolist()]
+                start += length
+                routes.append(Route(
                     source_id=source_id,
                     target_id=target_id,
-                    path=path.copy(),
-                    total_latency=total_latency,
-                    min_bandwidth=min_bandwidth,
-                    max_utilization=max_util,
-                    quality=quality
-                )
-                routes.append(route)
-                return
-                
-            if current in visited:
-                return
-                
-            visited.add(current)
-            
-            # Explore neighbors
-            if current in self.topology_cache:
-                for neighbor_id in self.topology_cache[current]:
-                    if neighbor_id not in visited:
-                        # Find link metrics
-                        link_latency, link_bandwidth, link_util = self._get_link_metrics(
-                            current, neighbor_id, telemetry
-                        )
-                        
-                        if link_latency is not None:  # Valid link
-                            new_path = path + [neighbor_id]
-                            new_latency = total_latency + link_latency
-                            new_min_bw = min(min_bandwidth, link_bandwidth)
-                            new_max_util = max(max_util, link_util)
-                            
-                            dfs_routes(neighbor_id, target, new_path, 
-                                     new_latency, new_min_bw, new_max_util)
-            
-            visited.remove(current)
-        
-        # Start DFS from source
-        dfs_routes(source_id, target_id, [source_id], 0.0, float('inf'), 0.0)
+                    path=path,
+                    total_latency=latency,
+                    min_bandwidth=bandwidth,
+                    max_utilization=util,
+                    quality=self._assess_route_quality(latency, bandwidth, util)
+                ))
         
         # Sort routes by quality
         routes.sort(key=lambda r: self._route_score(r), reverse=True)
         
         # Cache results
-        self.route_cache[(source_id, target_id)] = routes
+        if cache_key is not None:
+            self.route_cache[cache_key] = routes
+            if len(self.route_cache) > self.route_cache_size:
+                self.route_cache.popitem(last=False)
         return routes
     
     def analyze_network_health(self, telemetry: TelemetryFrame) -> Dict[str, any]:
@@ -187,40 +222,44 @@ class IntelligentRouter:
         }
         
         # Analyze components
-        for component in telemetry.components:
-            if component.status == ComponentStatus.HEALTHY:
-                analysis["healthy_components"] += 1
-            elif component.status == ComponentStatus.DEGRADED:
-                analysis["degraded_components"] += 1
-            else:
-                analysis["failed_components"] += 1
+        component_status = np.fromiter(
+            (_STATUS_CODE[c.status] for c in telemetry.components),
+            dtype=np.int8, count=len(telemetry.components)
+        )
+        status_counts = np.bincount(component_status, minlength=len(_STATUS_CODE))
+        analysis["healthy_components"] = int(status_counts[_STATUS_CODE[ComponentStatus.HEALTHY]])
+        analysis["degraded_components"] = int(status_counts[_STATUS_CODE[ComponentStatus.DEGRADED]])
+        analysis["failed_components"] = len(component_status) - analysis["healthy_components"] - analysis["degraded_components"]
         
         # Analyze links
-        total_latency = 0.0
-        total_utilization = 0.0
-        active_links = 0
+        table = LinkTable.from_links(telemetry.links)
+        healthy = table.status == _STATUS_CODE[ComponentStatus.HEALTHY]
+        congested = healthy & (
+            (table.utilization > self.reroute_thresholds["utilization_pct"]) |
+            (table.latency_ms > self.reroute_thresholds["latency_ms"])
+        )
         
-        for link in telemetry.links:
-            if link.status == ComponentStatus.HEALTHY:
-                analysis["healthy_links"] += 1
-                active_links += 1
-                total_latency += link.latency_ms
-                total_utilization += link.utilization
-                
-                # Check for congestion
-                if (link.utilization > self.reroute_thresholds["utilization_pct"] or
-                    link.latency_ms > self.reroute_thresholds["latency_ms"]):
-                    analysis["congested_links"] += 1
-                    analysis["bottlenecks"].append({
-                        "link_id": link.id,
-                        "source_id": link.source_id,
-                        "target_id": link.target_id,
-                        "latency_ms": link.latency_ms,
-                        "utilization_pct": link.utilization,
-                        "issue": "congestion"
-                    })
+        active_links = int(healthy.sum())
+        analysis["healthy_links"] = active_links
+        analysis["congested_links"] = int(congested.sum())
+        analysis["failed_links"] = len(telemetry.links) - active_links
+        
+        # Bottlenecks in link order: congested healthy links and all unhealthy links
+        idx = np.flatnonzero(congested | ~healthy)
+        for i, is_congested, latency, util in zip(idx.tolist(), congested[idx].tolist(),
+                                                  table.latency_ms[idx].tolist(),
+                                                  table.utilization[idx].tolist()):
+            link = telemetry.links[i]
+            if is_congested:
+                analysis["bottlenecks"].append({
+                    "link_id": link.id,
+                    "source_id": link.source_id,
+                    "target_id": link.target_id,
+                    "latency_ms": latency,
+                    "utilization_pct": util,
+                    "issue": "congestion"
+                })
             else:
-                analysis["failed_links"] += 1
                 analysis["bottlenecks"].append({
                     "link_id": link.id,
                     "source_id": link.source_id,
@@ -228,10 +267,10 @@ class IntelligentRouter:
                     "issue": "failure"
                 })
         
-        # Calculate averages
+        # Calculate averages over active links
         if active_links > 0:
-            analysis["avg_latency"] = total_latency / active_links
-            analysis["avg_utilization"] = total_utilization / active_links
+            analysis["avg_latency"] = float(table.latency_ms[healthy].mean())
+            analysis["avg_utilization"] = float(table.utilization[healthy].mean())
             
         return analysis
     
@@ -341,6 +380,65 @@ class IntelligentRouter:
         
         return stats
     
+    @staticmethod
+    def _links_fingerprint(telemetry: TelemetryFrame) -> int:
+        """Hash of the link state that route metrics depend on (coarsely rounded)"""
+        return hash(tuple(
+            (link.id, link.status.value, int(link.utilization), round(link.latency_ms, 1),
+             round(link.bandwidth_gbps, 1))
+            for link in telemetry.links
+        ))
+    
+    def _get_route_graph(self, telemetry: TelemetryFrame):
+        """CSR graph for the current topology, reused only while every link's edge values are unchanged"""
+        # Exact values, not the rounded fingerprint - the graph feeds route metrics directly
+        key = (self._topology_version, tuple(
+            (link.id, link.source_id, link.target_id, link.status, link.utilization,
+             link.latency_ms, link.bandwidth_gbps)
+            for link in telemetry.links
+        ))
+        if key == self._route_graph_key:
+            return self._route_graph
+        
+        node_ids = list(self.topology_cache.keys())
+        node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        graph = self._build_route_graph(node_ids, node_index, telemetry)
+        
+        self._route_graph_key = key
+        self._route_graph = (node_ids, node_index, graph)
+        return self._route_graph
+    
+    def _build_route_graph(self, node_ids: List[str], node_index: Dict[str, int],
+                           telemetry: TelemetryFrame) -> Tuple[np.ndarray, ...]:
+        """Flatten the topology into CSR adjacency arrays for the route kernel"""
+        # First link per component pair wins, matching _get_link_metrics
+        pair_links: Dict[Tuple[str, str], Link] = {}
+        for link in telemetry.links:
+            pair_links.setdefault((link.source_id, link.target_id), link)
+            pair_links.setdefault((link.target_id, link.source_id), link)
+        
+        indptr = [0]
+        neighbors, latency, bandwidth, utilization, valid = [], [], [], [], []
+        for node_id in node_ids:
+            for neighbor_id in self.topology_cache[node_id]:
+                link = pair_links.get((node_id, neighbor_id))
+                healthy = link is not None and link.status == ComponentStatus.HEALTHY
+                neighbors.append(node_index[neighbor_id])
+                latency.append(link.latency_ms if healthy else 0.0)
+                bandwidth.append(link.bandwidth_gbps if healthy else 0.0)
+                utilization.append(link.utilization if healthy else 100.0)
+                valid.append(healthy)
+            indptr.append(len(neighbors))
+        
+        return (
+            np.array(indptr, dtype=np.int64),
+            np.array(neighbors, dtype=np.int64),
+            np.array(latency, dtype=np.float64),
+            np.array(bandwidth, dtype=np.float64),
+            np.array(utilization, dtype=np.float64),
+            np.array(valid, dtype=np.bool_)
+        )
+    
     def _get_link_metrics(self, source_id: str, target_id: str, 
                          telemetry: TelemetryFrame) -> Tuple[Optional[float], float, float]:
         """Get link metrics between two components"""
@@ -5,7 +5,7 @@ Simulates CPUs, GPUs, memory, and their interconnects.
 import random
 import time
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import sys
 from pathlib import Path
 # Add parent directory to path for imports
@@ -15,6 +15,35 @@ from schemas import (
     HardwareComponent, Link, TelemetryFrame, ComponentType, 
     LinkType, ComponentStatus, SystemState, Scorecard
 )
+from providers.sim_kernels import step_components, step_links
+
+
+# Dense index per component type, used to gather per-type constants
+_TYPE_IDX = {t: i for i, t in enumerate(ComponentType)}
+
+# Idle power draw (watts) per component type
+_BASE_POWER = np.full(len(_TYPE_IDX), 50.0)  # Default for types without a profile
+_BASE_POWER[_TYPE_IDX[ComponentType.CPU]] = 150
+_BASE_POWER[_TYPE_IDX[ComponentType.GPU]] = 300
+_BASE_POWER[_TYPE_IDX[ComponentType.MEMORY]] = 20
+_BASE_POWER[_TYPE_IDX[ComponentType.SWITCH]] = 15
+_BASE_POWER[_TYPE_IDX[ComponentType.STORAGE]] = 10
+
+# Integer status codes understood by the numeric kernels
+_STATUS_BY_CODE = (
+    ComponentStatus.HEALTHY,   # 0
+    ComponentStatus.DEGRADED,  # 1
+    ComponentStatus.FAILED,    # 2
+    ComponentStatus.OFFLINE    # 3
+)
+_STATUS_CODE = {status: code for code, status in enumerate(_STATUS_BY_CODE)}
+_HEALTHY = _STATUS_CODE[ComponentStatus.HEALTHY]
+_DEGRADED = _STATUS_CODE[ComponentStatus.DEGRADED]
+_FAILED = _STATUS_CODE[ComponentStatus.FAILED]
+
+# Link error rate scale per status code: very low when healthy, higher when
+# degraded. Failed/offline links are pinned at 100% instead.
+_LINK_ERROR_SCALE = np.array([0.001, 0.1, 0.0, 0.0])
 
 
 class HardwareSimulator:
@@ -25,6 +54,7 @@ class HardwareSimulator:
         self.seed = seed
         random.seed(seed)
         np.random.seed(seed)
+        self.rng = np.random.default_rng(seed)
         
         self.components: Dict[str, HardwareComponent] = {}
         self.links: Dict[str, Link] = {}
@@ -141,6 +171,8 @@ class HardwareSimulator:
         
         for link in links:
             self.links[link.id] = link
+        
+        self._build_arrays()
     
     def _create_realistic_datacenter_topology(self):
         """Create a 16-node realistic data center topology matching the frontend layout"""
@@ -400,184 +432,215 @@ class HardwareSimulator:
         
         for link in links:
             self.links[link.id] = link
+        
+        self._build_arrays()
     
-    def _simulate_component_metrics(self, component: HardwareComponent) -> HardwareComponent:
-        """Update component metrics with realistic simulation"""
-        
-        # Base utilization with some randomness
-        base_util = random.uniform(10, 80)
-        noise = np.random.normal(0, self.base_noise_level * 10)
-        component.utilization = max(0, min(100, base_util + noise))
-        
-        # Temperature correlates with utilization
-        ambient_temp = 25.0
-        temp_per_util = 0.8  # 0.8C per 1% utilization
-        component.temperature = ambient_temp + (component.utilization * temp_per_util) + np.random.normal(0, 2)
-        component.temperature = max(0, min(150, component.temperature))
-        
-        # Power draw correlates with utilization and component type
-        base_power = {
-            ComponentType.CPU: 150,
-            ComponentType.GPU: 300, 
-            ComponentType.MEMORY: 20,
-            ComponentType.SWITCH: 15,
-            ComponentType.STORAGE: 10
-        }.get(component.component_type, 50)
-        
-        power_scaling = 0.3 + (component.utilization / 100) * 0.7  # 30% base + 70% variable
-        component.power_draw = base_power * power_scaling + np.random.normal(0, base_power * 0.05)
-        component.power_draw = max(0, component.power_draw)
-        
-        return component
+    def _build_arrays(self):
+        """Lay out component and link metrics as flat arrays for the step kernels"""
+        self._comp_list: List[HardwareComponent] = list(self.components.values())
+        self._link_list: List[Link] = list(self.links.values())
+        
+        # Component state
+        self._util = np.array([c.utilization for c in self._comp_list], dtype=np.float64)
+        self._temp = np.array([c.temperature for c in self._comp_list], dtype=np.float64)
+        self._power = np.array([c.power_draw for c in self._comp_list], dtype=np.float64)
+        self._comp_type_idx = np.array(
+            [_TYPE_IDX[c.component_type] for c in self._comp_list], dtype=np.intp
+        )
+        self._comp_base_power = _BASE_POWER[self._comp_type_idx]
+        self._comp_status = np.array(
+            [_STATUS_CODE[c.status] for c in self._comp_list], dtype=np.int8
+        )
+        
+        # Link state
+        self._link_util = np.array([l.utilization for l in self._link_list], dtype=np.float64)
+        self._link_lat = np.array([l.latency_ms for l in self._link_list], dtype=np.float64)
+        self._link_bw = np.array([l.bandwidth_gbps for l in self._link_list], dtype=np.float64)
+        self._link_err = np.array([l.error_rate for l in self._link_list], dtype=np.float64)
+        self._link_status = np.array(
+            [_STATUS_CODE[l.status] for l in self._link_list], dtype=np.int8
+        )
+        self._link_max_bw = np.array([l.max_bandwidth_gbps for l in self._link_list], dtype=np.float64)
+        self._link_max_lat = np.array([l.max_latency_ms for l in self._link_list], dtype=np.float64)
+        self._link_base_lat = self._link_max_lat * 0.1  # Unloaded latency is 10% of max
+        self._link_lat_cap = self._link_max_lat * 5.0
+        
+        # Random draw buffers, refilled in place every step
+        n_comp, n_link = len(self._comp_list), len(self._link_list)
+        self._buf_u_comp = np.empty(n_comp)
+        self._buf_n_comp = np.empty((3, n_comp))
+        self._buf_u_link = np.empty(n_link)
+        self._buf_n_link = np.empty((2, n_link))
+        self._buf_e_link = np.empty(n_link)
+        
+        # Static topology skeleton - only status changes after construction
+        self._topo_comp_entries = [
+            {"name": c.name, "type": c.component_type.value, "status": c.status.value}
+            for c in self._comp_list
+        ]
+        self._topo_link_entries = [
+            {"source": l.source_id, "target": l.target_id,
+             "type": l.link_type.value, "status": l.status.value}
+            for l in self._link_list
+        ]
+        self._topo_cache = {
+            "components": {c.id: e for c, e in zip(self._comp_list, self._topo_comp_entries)},
+            "links": {l.id: e for l, e in zip(self._link_list, self._topo_link_entries)}
+        }
     
-    def _simulate_link_metrics(self, link: Link) -> Link:
-        """Update link metrics with realistic simulation"""
-        
-        # Base utilization
-        base_util = random.uniform(5, 60)
-        noise = np.random.normal(0, self.base_noise_level * 5)
-        link.utilization = max(0, min(100, base_util + noise))
-        
-        # Latency increases with utilization (queueing delay)
-        base_latency = link.max_latency_ms * 0.1  # 10% of max as baseline
-        util_factor = 1 + (link.utilization / 100) * 2  # Up to 3x increase at 100% util
-        link.latency_ms = base_latency * util_factor + np.random.normal(0, base_latency * 0.1)
-        link.latency_ms = max(0.001, min(link.max_latency_ms * 5, link.latency_ms))
-        
-        # Bandwidth utilization
-        link.bandwidth_gbps = (link.utilization / 100) * link.max_bandwidth_gbps
-        
-        # Error rate (very low for healthy links)
-        if link.status == ComponentStatus.HEALTHY:
-            link.error_rate = max(0, np.random.exponential(0.001))  # Very low error rate
-        elif link.status == ComponentStatus.DEGRADED:
-            link.error_rate = max(0, np.random.exponential(0.1))   # Higher error rate
-        else:
-            link.error_rate = 100.0  # Failed link
-            
-        link.error_rate = min(100, link.error_rate)
+    def _simulate_components(self):
+        """Advance all component metrics by one step"""
+        uniforms, normals = self._buf_u_comp, self._buf_n_comp
+        self.rng.random(out=uniforms)
+        uniforms *= 70.0  # uniform(10, 80)
+        uniforms += 10.0
+        self.rng.standard_normal(out=normals)
+        
+        step_components(
+            self._util, self._temp, self._power, self._comp_base_power,
+            uniforms, normals[0], normals[1], normals[2],
+            self.base_noise_level
+        )
+    
+    def _simulate_links(self):
+        """Advance all link metrics by one step"""
+        uniforms, normals, exponentials = self._buf_u_link, self._buf_n_link, self._buf_e_link
+        self.rng.random(out=uniforms)
+        uniforms *= 55.0  # uniform(5, 60)
+        uniforms += 5.0
+        self.rng.standard_normal(out=normals)
+        self.rng.standard_exponential(out=exponentials)
+        
+        step_links(
+            self._link_util, self._link_lat, self._link_bw,
+            self._link_max_bw, self._link_base_lat, self._link_lat_cap,
+            uniforms, normals[0], normals[1],
+            self.base_noise_level
+        )
         
-        return link
+        # Error rate depends only on status - scale exponential noise per link
+        status = self._link_status
+        np.multiply(exponentials, _LINK_ERROR_SCALE[status], out=self._link_err)
+        np.putmask(self._link_err, status >= _FAILED, 100.0)
+        np.minimum(self._link_err, 100.0, out=self._link_err)
+    
+    def _sync_models(self):
+        """Copy array state back onto the Pydantic models"""
+        # Write straight into the model __dict__ to skip BaseModel.__setattr__
+        for comp, util, temp, power, code in zip(self._comp_list, self._util.tolist(),
+                                                 self._temp.tolist(), self._power.tolist(),
+                                                 self._comp_status.tolist()):
+            comp.__dict__.update(utilization=util, temperature=temp, power_draw=power,
+                                 status=_STATUS_BY_CODE[code])
+        
+        for link, util, lat, bw, err, code in zip(self._link_list, self._link_util.tolist(),
+                                                  self._link_lat.tolist(), self._link_bw.tolist(),
+                                                  self._link_err.tolist(), self._link_status.tolist()):
+            link.__dict__.update(utilization=util, latency_ms=lat, bandwidth_gbps=bw, error_rate=err,
+                                 status=_STATUS_BY_CODE[code])
     
     def step(self) -> TelemetryFrame:
         """Advance simulation by one time step and return telemetry"""
+        self.advance()
+        return self.snapshot()
+    
+    def advance(self):
+        """Advance simulation by one time step without building telemetry"""
         self.time_step += 1
-        
-        # Update all components
-        for comp_id in self.components:
-            self.components[comp_id] = self._simulate_component_metrics(self.components[comp_id])
-        
-        # Update all links  
-        for link_id in self.links:
-            self.links[link_id] = self._simulate_link_metrics(self.links[link_id])
+        self._simulate_components()
+        self._simulate_links()
+    
+    def snapshot(self) -> TelemetryFrame:
+        """Materialize the current array state as a telemetry frame"""
+        self._sync_models()
         
         # Calculate system-wide metrics
         system_metrics = self._calculate_system_metrics()
         
-        return TelemetryFrame(
-            components=list(self.components.values()),
-            links=list(self.links.values()),
+        # Models are already valid - skip revalidating every element.
+        # The component/link lists are built once per topology and shared by frames.
+        return TelemetryFrame.model_construct(
+            components=self._comp_list,
+            links=self._link_list,
             system_metrics=system_metrics
         )
     
+    def get_system_metrics(self) -> Dict[str, float]:
+        """Get system-wide metrics without materializing a telemetry frame"""
+        return self._calculate_system_metrics()
+    
     def _calculate_system_metrics(self) -> Dict[str, float]:
         """Calculate system-wide performance metrics"""
         if not self.components:
             return {}
         
-        # Average utilization across all components
-        avg_utilization = np.mean([comp.utilization for comp in self.components.values()])
-        
-        # Total power consumption
-        total_power = sum(comp.power_draw for comp in self.components.values())
-        
-        # Average temperature
-        avg_temperature = np.mean([comp.temperature for comp in self.components.values()])
-        
         # Network metrics
         if self.links:
-            avg_latency = np.mean([link.latency_ms for link in self.links.values()])
-            total_bandwidth = sum(link.bandwidth_gbps for link in self.links.values())
-            avg_error_rate = np.mean([link.error_rate for link in self.links.values()])
+            avg_latency = float(self._link_lat.mean())
+            total_bandwidth = float(self._link_bw.sum())
+            avg_error_rate = float(self._link_err.mean())
         else:
             avg_latency = 0
             total_bandwidth = 0
             avg_error_rate = 0
         
         return {
-            "avg_utilization": avg_utilization,
-            "total_power_watts": total_power,
-            "avg_temperature_c": avg_temperature,
+            "avg_utilization": float(self._util.mean()),
+            "total_power_watts": float(self._power.sum()),
+            "avg_temperature_c": float(self._temp.mean()),
             "avg_latency_ms": avg_latency,
             "total_bandwidth_gbps": total_bandwidth,
             "avg_error_rate": avg_error_rate,
-            "healthy_components": sum(1 for c in self.components.values() if c.status == ComponentStatus.HEALTHY),
-            "healthy_links": sum(1 for l in self.links.values() if l.status == ComponentStatus.HEALTHY)
+            "healthy_components": int((self._comp_status == _HEALTHY).sum()),
+            "healthy_links": int((self._link_status == _HEALTHY).sum())
         }
     
     def update(self):
-        """Update the simulation by one time step"""
-        self.time_step += 1
-        
-        # Update all components
-        for component in self.components.values():
-            self._simulate_component_metrics(component)
-        
-        # Update all links
-        for link in self.links.values():
-            self._simulate_link_metrics(link)
+        """Update the simulation by one time step (same as advance())"""
+        self.advance()
     
     def recover_from_chaos(self):
         """Gradually recover system from chaos effects - MUCH SLOWER HEALING"""
         current_time = time.time()
         
         # VERY SLOWLY recover components
-        for component in self.components.values():
-            if component.status == ComponentStatus.FAILED:
+        for i, component in enumerate(self._comp_list):
+            if self._comp_status[i] == _FAILED:
                 # Stay failed for longer, then move to degraded
                 if not hasattr(self, 'component_failure_times'):
                     self.component_failure_times = {}
                 if component.id not in self.component_failure_times:
                     self.component_failure_times[component.id] = current_time
                 elif current_time - self.component_failure_times[component.id] > 5:  # Stay failed for 5 seconds
-                    component.status = ComponentStatus.DEGRADED
-            elif component.status == ComponentStatus.DEGRADED:
+                    self._comp_status[i] = _DEGRADED
+            elif self._comp_status[i] == _DEGRADED:
                 # MUCH SLOWER improvement
-                component.utilization = max(20, component.utilization * 0.99)  # Very slowly reduce (was 0.95)
-                component.temperature = max(25, component.temperature * 0.995)  # Very slowly cool (was 0.98)
-                if component.utilization < 30 and component.temperature < 40:
-                    component.status = ComponentStatus.HEALTHY
+                self._util[i] = max(20, self._util[i] * 0.99)  # Very slowly reduce (was 0.95)
+                self._temp[i] = max(25, self._temp[i] * 0.995)  # Very slowly cool (was 0.98)
+                if self._util[i] < 30 and self._temp[i] < 40:
+                    self._comp_status[i] = _HEALTHY
         
         # VERY SLOWLY recover links
-        for link in self.links.values():
-            if link.status == ComponentStatus.FAILED:
+        for i, link in enumerate(self._link_list):
+            if self._link_status[i] == _FAILED:
                 # Stay failed for longer
                 if not hasattr(self, 'link_failure_times'):
                     self.link_failure_times = {}
                 if link.id not in self.link_failure_times:
                     self.link_failure_times[link.id] = current_time
                 elif current_time - self.link_failure_times[link.id] > 5:  # Stay failed for 5 seconds
-                    link.status = ComponentStatus.DEGRADED
-            elif link.status == ComponentStatus.DEGRADED:
+                    self._link_status[i] = _DEGRADED
+            elif self._link_status[i] == _DEGRADED:
                 # MUCH SLOWER improvement
-                link.utilization = max(10, link.utilization * 0.95)  # Very slowly reduce (was 0.9)
-                link.error_rate = max(0.01, link.error_rate * 0.9)  # Very slowly reduce (was 0.8)
-                link.latency_ms = max(link.max_latency_ms, link.latency_ms * 0.95)  # Very slowly reduce (was 0.9)
-                if link.utilization < 20 and link.error_rate < 1:
-                    link.status = ComponentStatus.HEALTHY
+                self._link_util[i] = max(10, self._link_util[i] * 0.95)  # Very slowly reduce (was 0.9)
+                self._link_err[i] = max(0.01, self._link_err[i] * 0.9)  # Very slowly reduce (was 0.8)
+                self._link_lat[i] = max(self._link_max_lat[i], self._link_lat[i] * 0.95)  # Very slowly reduce (was 0.9)
+                if self._link_util[i] < 20 and self._link_err[i] < 1:
+                    self._link_status[i] = _HEALTHY
     
     def get_telemetry(self) -> TelemetryFrame:
         """Get current telemetry data"""
-        # Calculate system-wide metrics
-        system_metrics = self._calculate_system_metrics()
-        
-        # Create telemetry frame with components and links
-        return TelemetryFrame(
-            timestamp=time.time(),
-            components=list(self.components.values()),
-            links=list(self.links.values()),
-            system_metrics=system_metrics
-        )
+        return self.snapshot()
     
     def inject_chaos(self, target_id: str = None, chaos_type: str = "latency_spike"):
         """Inject a chaos event for testing"""
@@ -603,24 +666,68 @@ class HardwareSimulator:
             self.link_failure_times.clear()
         
         # DESTROY ALL COMPONENTS
-        for comp in self.components.values():
-            comp.utilization = 100.0  # MAX OUT EVERYTHING
-            comp.temperature = 150.0  # MAXIMUM TEMPERATURE
-            comp.status = ComponentStatus.FAILED  # COMPLETE SYSTEM FAILURE
+        self._util[:] = 100.0  # MAX OUT EVERYTHING
+        self._temp[:] = 150.0  # MAXIMUM TEMPERATURE
+        self._comp_status[:] = _FAILED  # COMPLETE SYSTEM FAILURE
+        for comp in self._comp_list:
             print(f"💥💥💥 SYSTEM CHAOS: {comp.name} FAILED! Util: 100%, Temp: 150°C")
             affected_count += 1
         
         # DESTROY ALL LINKS
-        for link in self.links.values():
-            link.latency_ms = min(1000.0, link.max_latency_ms * 100)  # Cap at 1000ms to avoid Infinity
-            link.utilization = 100.0  # MAX OUT
-            link.error_rate = 50.0  # MAXIMUM ERROR RATE
-            link.status = ComponentStatus.FAILED  # COMPLETE FAILURE
-            print(f"💥💥💥 SYSTEM CHAOS: {link.id} FAILED! Latency: {link.latency_ms:.2f}ms, Util: 100%, Errors: 50%")
+        np.minimum(1000.0, self._link_max_lat * 100, out=self._link_lat)  # Cap at 1000ms to avoid Infinity
+        self._link_util[:] = 100.0  # MAX OUT
+        self._link_err[:] = 50.0  # MAXIMUM ERROR RATE
+        self._link_status[:] = _FAILED  # COMPLETE FAILURE
+        for i, link in enumerate(self._link_list):
+            print(f"💥💥💥 SYSTEM CHAOS: {link.id} FAILED! Latency: {self._link_lat[i]:.2f}ms, Util: 100%, Errors: 50%")
             affected_count += 1
         
         print(f"💀💀💀 TOTAL SYSTEM DESTRUCTION: {affected_count} components/links DESTROYED! 💀💀💀")
     
+    def apply_cut(self) -> Optional[HardwareComponent]:
+        """Shed load from the busiest component; returns it if it was cut"""
+        if not self._comp_list:
+            return None
+        
+        i = int(self._util.argmax())
+        if self._util[i] <= 60:
+            return None
+        
+        self._util[i] *= 0.7
+        return self._comp_list[i]
+    
+    def apply_heal(self, max_temp: Optional[float] = None) -> Optional[HardwareComponent]:
+        """
+        Repair the first unhealthy component; returns it if one was healed.
+        If max_temp is given, components running hotter than it also count.
+        """
+        needs_heal = self._comp_status != _HEALTHY
+        if max_temp is not None:
+            needs_heal |= self._temp > max_temp
+        
+        candidates = np.flatnonzero(needs_heal)
+        if candidates.size == 0:
+            return None
+        
+        i = int(candidates[0])
+        self._comp_status[i] = _HEALTHY
+        self._temp[i] *= 0.8  # Cool down
+        return self._comp_list[i]
+    
+    def apply_reroute(self, max_links: int = 2) -> List[Link]:
+        """Relieve up to max_links congested links; returns the links rerouted"""
+        congested = np.flatnonzero(self._link_util > 70)[:max_links]
+        self._link_util[congested] *= 0.6
+        self._link_lat[congested] *= 0.8
+        return [self._link_list[i] for i in congested]
+    
+    def apply_shield(self):
+        """Cool, unload and clean up the whole system at once"""
+        self._temp *= 0.9
+        self._util *= 0.95
+        self._link_err *= 0.5
+        self._link_util *= 0.9
+    
     def get_component_ids(self) -> List[str]:
         """Get list of all component IDs"""
         return list(self.components.keys())
@@ -630,23 +737,9 @@ class HardwareSimulator:
         return list(self.links.keys())
     
     def get_topology_summary(self) -> Dict:
-        """Get a summary of the current topology"""
-        return {
-            "components": {
-                comp_id: {
-                    "name": comp.name,
-                    "type": comp.component_type.value,
-                    "status": comp.status.value
-                }
-                for comp_id, comp in self.components.items()
-            },
-            "links": {
-                link_id: {
-                    "source": link.source_id,
-                    "target": link.target_id, 
-                    "type": link.link_type.value,
-                    "status": link.status.value
-                }
-                for link_id, link in self.links.items()
-            }
-        }
+        """Get a summary of the current topology (shared cache - treat as read-only)"""
+        for entry, code in zip(self._topo_comp_entries, self._comp_status.tolist()):
+            entry["status"] = _STATUS_BY_CODE[code].value
+        for entry, code in zip(self._topo_link_entries, self._link_status.tolist()):
+            entry["status"] = _STATUS_BY_CODE[code].value
+        return self._topo_cache
@@ -0,0 +1,98 @@
+"""
+Numeric kernels for the hardware simulation step.
+Operates on flat NumPy arrays (one slot per component/link) so the hot path
+never touches Pydantic models. Compiled with Numba when it is installed,
+otherwise falls back to whole-array NumPy operations.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional - use the vectorized NumPy kernels
+    NUMBA_AVAILABLE = False
+
+
+# Thermal model
+AMBIENT_TEMP_C = 25.0
+TEMP_PER_UTIL = 0.8  # 0.8C per 1% utilization
+
+
+def _step_components_numpy(util, temp, power, base_power, r_uni, r_n1, r_n2, r_n3, noise_level):
+    """Vectorized step_components; the random inputs are used as scratch space"""
+    # Base utilization with some randomness
+    np.multiply(r_n1, noise_level * 10.0, out=util)
+    util += r_uni
+    np.clip(util, 0.0, 100.0, out=util)
+
+    # Temperature correlates with utilization
+    np.multiply(util, TEMP_PER_UTIL, out=temp)
+    temp += AMBIENT_TEMP_C
+    r_n2 *= 2.0
+    temp += r_n2
+    np.clip(temp, 0.0, 150.0, out=temp)
+
+    # Power draw: 30% base + 70% variable, i.e. bp * (0.3 + u * 0.007 + 0.05 * noise)
+    np.multiply(util, 0.007, out=power)
+    power += 0.3
+    r_n3 *= 0.05
+    power += r_n3
+    power *= base_power
+    np.maximum(power, 0.0, out=power)
+
+
+def _step_links_numpy(util, latency, bandwidth, max_bandwidth, base_latency, latency_cap,
+                      r_uni, r_n1, r_n2, noise_level):
+    """Vectorized step_links; the random inputs are used as scratch space"""
+    np.multiply(r_n1, noise_level * 5.0, out=util)
+    util += r_uni
+    np.clip(util, 0.0, 100.0, out=util)
+
+    # Latency increases with utilization (queueing delay), up to 3x at 100%
+    np.multiply(util, 0.02, out=latency)
+    latency += 1.0
+    r_n2 *= 0.1
+    latency += r_n2
+    latency *= base_latency
+    np.clip(latency, 0.001, latency_cap, out=latency)
+
+    np.multiply(util, 0.01, out=bandwidth)
+    bandwidth *= max_bandwidth
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def step_components(util, temp, power, base_power, r_uni, r_n1, r_n2, r_n3, noise_level):
+        """Update component utilization, temperature and power draw in place"""
+        for i in prange(util.shape[0]):
+            # Base utilization with some randomness
+            u = r_uni[i] + r_n1[i] * noise_level * 10.0
+            u = min(100.0, max(0.0, u))
+            util[i] = u
+
+            # Temperature correlates with utilization
+            t = AMBIENT_TEMP_C + u * TEMP_PER_UTIL + r_n2[i] * 2.0
+            temp[i] = min(150.0, max(0.0, t))
+
+            # Power draw: 30% base + 70% variable
+            bp = base_power[i]
+            p = bp * (0.3 + (u / 100.0) * 0.7) + r_n3[i] * bp * 0.05
+            power[i] = max(0.0, p)
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def step_links(util, latency, bandwidth, max_bandwidth, base_latency, latency_cap,
+                   r_uni, r_n1, r_n2, noise_level):
+        """Update link utilization, latency and bandwidth in place"""
+        for i in prange(util.shape[0]):
+            u = r_uni[i] + r_n1[i] * noise_level * 5.0
+            u = min(100.0, max(0.0, u))
+            util[i] = u
+
+            # Latency increases with utilization (queueing delay), up to 3x at 100%
+            lat = base_latency[i] * (1.0 + u * 0.02 + r_n2[i] * 0.1)
+            latency[i] = min(latency_cap[i], max(0.001, lat))
+
+            bandwidth[i] = (u / 100.0) * max_bandwidth[i]
+else:
+    step_components = _step_components_numpy
+    step_links = _step_links_numpy
@@ -74,6 +74,13 @@ class TelemetryFrame(BaseModel):
     components: List[HardwareComponent]
     links: List[Link]
     system_metrics: Dict[str, float] = Field(default_factory=dict)
+    
+    def snapshot(self) -> "TelemetryFrame":
+        """Copy sharing the components but owning its links - mutate the copy's links freely"""
+        return self.model_copy(update={
+            "links": [link.model_copy() for link in self.links],
+            "system_metrics": dict(self.system_metrics)
+        })
 
 
 class ActionLog(BaseModel):
@@ -6,29 +6,50 @@ This is the full interactive experience!
 
 import sys
 import cv2
+import numpy as np
 import time
 import threading
-import queue
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from providers.sim import HardwareSimulator
-from schemas import ComponentStatus
 from gesture_recognition import GestureRecognizer, GestureResult
 
+# AI adversary attack table: (target, chaos type, message)
+_ATTACKS = (
+    ("cpu_0", "overload", "💥 AI overloads CPU!"),
+    ("gpu_0", "overheat", "🔥 AI overheats GPU!"),
+    ("cpu_switch_link", "congestion", "🌊 AI floods network!"),
+    ("switch_gpu_link", "latency_spike", "⚡ AI spikes latency!"),
+    ("mem_0", "overload", "📈 AI stresses memory!")
+)
+
+# cv2.pollKey (OpenCV 4.5+) pumps GUI events without waitKey's 1 ms sleep
+_poll_key = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+
+# How long the main loop waits for a camera frame before polling the keyboard anyway
+FRAME_WAIT_S = 0.1
+
+# Resilience score penalties: slope per unit over threshold, capped
+PERF_PEN_THRESHOLD, PERF_PEN_SLOPE, PERF_PEN_MAX = 80.0, 0.2, 20.0  # % utilization
+TEMP_PEN_THRESHOLD, TEMP_PEN_SLOPE, TEMP_PEN_MAX = 70.0, 0.2, 15.0  # °C
+LAT_PEN_THRESHOLD, LAT_PEN_SLOPE, LAT_PEN_MAX = 1.0, 10.0, 15.0  # ms
 
 class SynapseNetLiveDemo:
     """Complete live demo with gesture control and hardware simulation"""
     
+    FONT = cv2.FONT_HERSHEY_SIMPLEX
+    
     def __init__(self):
         print("🚀 Initializing SynapseNet Live Demo...")
         
         # Initialize hardware simulation
         self.simulator = HardwareSimulator(seed=42)
         self.simulation_running = True
-        self.sim_data_queue = queue.Queue(maxsize=10)
+        self._latest_telemetry = None  # Last frame materialized for the main loop
+        self._telemetry_tick = -1  # Simulator time step _latest_telemetry reflects
         
         # Initialize gesture recognition
         self.gesture_recognizer = GestureRecognizer()
@@ -40,6 +61,17 @@ class SynapseNetLiveDemo:
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         
+        # Frame buffers shared with the capture thread (reused every frame). Sized from
+        # the first frame read - some backends report 0 or a stale size via cap.get
+        self._frame_buf = None
+        self._flip_buf = None
+        
+        # Static background for the info panel, blended into its ROI each frame
+        self._panel_bg = np.zeros((291, 341, 3), dtype=np.uint8)
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Event()
+        self.camera_running = True
+        
         # Game state
         self.score = 100.0  # Starting resilience score
         self.actions_taken = 0
@@ -71,34 +103,64 @@ class SynapseNetLiveDemo:
         sim_thread = threading.Thread(target=self._simulation_loop, daemon=True)
         sim_thread.start()
         
+        # Start camera capture thread
+        capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        capture_thread.start()
+        
         try:
             self._main_loop()
         except KeyboardInterrupt:
             print("\n⚡ Demo interrupted by user")
         finally:
             self.simulation_running = False
+            self.camera_running = False
+            capture_thread.join(timeout=1.0)
             self.cap.release()
             cv2.destroyAllWindows()
             print("🧹 Demo cleanup complete")
     
+    def _capture_loop(self):
+        """Background camera capture loop"""
+        try:
+            while self.camera_running:
+                ret, frame = self.cap.read()
+                if not ret:
+                    print("❌ Camera read failed")
+                    break
+                
+                with self._frame_lock:
+                    if self._frame_buf is None or self._frame_buf.shape != frame.shape:
+                        self._frame_buf = np.empty_like(frame)
+                        self._flip_buf = np.empty_like(frame)
+                    np.copyto(self._frame_buf, frame)
+                self._frame_ready.set()
+        finally:
+            # Even if the thread dies, let the main loop see it and exit
+            self.camera_running = False
+            self._frame_ready.set()
+    
     def _simulation_loop(self):
         """Background simulation loop"""
+        tick_interval = 0.1  # 10 FPS simulation
+        next_deadline = time.monotonic()
         while self.simulation_running:
             try:
-                # Step simulation
-                telemetry = self.simulator.step()
+                # Step simulation (arrays only - frames are built on demand)
+                self.simulator.advance()
                 
                 # AI adversary attacks
                 self._ai_adversary_logic()
                 
                 # Calculate score
-                self._update_score(telemetry)
+                self._update_score(self.simulator.get_system_metrics())
                 
-                # Put data in queue for main thread
-                if not self.sim_data_queue.full():
-                    self.sim_data_queue.put(telemetry)
-                
-                time.sleep(0.1)  # 10 FPS simulation
+                # Sleep until the next tick deadline so step time doesn't add drift
+                next_deadline += tick_interval
+                sleep_for = next_deadline - time.monotonic()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    next_deadline = time.monotonic()  # Fell behind - don't try to catch up
                 
             except Exception as e:
                 print(f"❌ Simulation error: {e}")
@@ -113,42 +175,29 @@ class SynapseNetLiveDemo:
             self.ai_attacks += 1
             
             # Choose random attack
-            import random
-            attacks = [
-                ("cpu_0", "overload", "💥 AI overloads CPU!"),
-                ("gpu_0", "overheat", "🔥 AI overheats GPU!"),
-                ("cpu_switch_link", "congestion", "🌊 AI floods network!"),
-                ("switch_gpu_link", "latency_spike", "⚡ AI spikes latency!"),
-                ("mem_0", "overload", "📈 AI stresses memory!")
-            ]
-            
-            target, chaos_type, message = random.choice(attacks)
+            target, chaos_type, message = _ATTACKS[self.simulator.rng.integers(len(_ATTACKS))]
             self.simulator.inject_chaos(target, chaos_type)
             print(f"\n{message}")
     
-    def _update_score(self, telemetry):
+    def _update_score(self, metrics):
         """Update resilience score based on system health"""
-        # Calculate health factors
-        healthy_components = sum(1 for c in telemetry.components if c.status == ComponentStatus.HEALTHY)
-        healthy_links = sum(1 for l in telemetry.links if l.status == ComponentStatus.HEALTHY)
+        total_components = len(self.simulator.components)
+        total_links = len(self.simulator.links)
         
-        total_components = len(telemetry.components)
-        total_links = len(telemetry.links)
-        
-        # Health percentage
-        component_health = healthy_components / total_components if total_components > 0 else 0
-        link_health = healthy_links / total_links if total_links > 0 else 0
+        # Health percentage (healthy counts come from the simulator's status arrays)
+        component_health = metrics.get('healthy_components', 0) / total_components if total_components > 0 else 0
+        link_health = metrics.get('healthy_links', 0) / total_links if total_links > 0 else 0
         
         # Performance factors
-        avg_util = telemetry.system_metrics.get('avg_utilization', 50)
-        avg_temp = telemetry.system_metrics.get('avg_temperature_c', 50)
-        avg_latency = telemetry.system_metrics.get('avg_latency_ms', 0.1)
+        avg_util = metrics.get('avg_utilization', 50)
+        avg_temp = metrics.get('avg_temperature_c', 50)
+        avg_latency = metrics.get('avg_latency_ms', 0.1)
         
         # Calculate score (0-100)
         health_score = (component_health + link_health) * 50  # 0-100
-        performance_penalty = min(20, max(0, (avg_util - 80) / 5))  # High utilization penalty
-        temp_penalty = min(15, max(0, (avg_temp - 70) / 5))  # High temperature penalty  
-        latency_penalty = min(15, max(0, (avg_latency - 1.0) * 10))  # High latency penalty
+        performance_penalty = min(PERF_PEN_MAX, max(0, (avg_util - PERF_PEN_THRESHOLD) * PERF_PEN_SLOPE))
+        temp_penalty = min(TEMP_PEN_MAX, max(0, (avg_temp - TEMP_PEN_THRESHOLD) * TEMP_PEN_SLOPE))
+        latency_penalty = min(LAT_PEN_MAX, max(0, (avg_latency - LAT_PEN_THRESHOLD) * LAT_PEN_SLOPE))
         
         target_score = health_score - performance_penalty - temp_penalty - latency_penalty
         
@@ -181,107 +230,86 @@ class SynapseNetLiveDemo:
         """Cut action - isolate problematic components"""
         print("✂️ CUT ACTION! Isolating problematic components...")
         
-        # Find most utilized component and reduce its load
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            max_util_comp = max(latest_telemetry.components, key=lambda c: c.utilization)
-            if max_util_comp.utilization > 60:
-                # Simulate load reduction
-                max_util_comp.utilization *= 0.7
-                self.score += 5  # Reward for good action
-                print(f"   Reduced load on {max_util_comp.name}")
+        # Reduce load on the most utilized component
+        comp = self.simulator.apply_cut()
+        if comp is not None:
+            self.score += 5  # Reward for good action
+            print(f"   Reduced load on {comp.name}")
     
     def _action_heal(self):
         """Heal action - repair degraded systems"""
         print("✊ HEAL ACTION! Repairing degraded systems...")
         
-        # Find failed/degraded components and heal them
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            healed = False
-            for comp in latest_telemetry.components:
-                if comp.status != ComponentStatus.HEALTHY:
-                    comp.status = ComponentStatus.HEALTHY
-                    comp.temperature *= 0.8  # Cool down
-                    healed = True
-                    print(f"   Healed {comp.name}")
-                    break
-            
-            if healed:
-                self.score += 8
-            else:
-                print("   No components need healing")
+        comp = self.simulator.apply_heal()
+        if comp is not None:
+            self.score += 8
+            print(f"   Healed {comp.name}")
+        else:
+            print("   No components need healing")
     
     def _action_reroute(self):
         """Reroute action - optimize network paths"""
         print("✋ REROUTE ACTION! Optimizing network paths...")
         
-        # Find congested links and reduce their utilization
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            congested_links = [l for l in latest_telemetry.links if l.utilization > 70]
-            if congested_links:
-                for link in congested_links[:2]:  # Fix up to 2 links
-                    link.utilization *= 0.6
-                    link.latency_ms *= 0.8
-                    print(f"   Rerouted traffic from {link.id}")
-                self.score += 6
-            else:
-                print("   Network is running smoothly")
+        # Fix up to 2 congested links
+        rerouted = self.simulator.apply_reroute(max_links=2)
+        if rerouted:
+            for link in rerouted:
+                print(f"   Rerouted traffic from {link.id}")
+            self.score += 6
+        else:
+            print("   Network is running smoothly")
     
     def _action_shield(self):
         """Shield action - boost overall system resilience"""
         print("🙌 SHIELD ACTION! Boosting system resilience!")
         
-        # Global system boost
-        latest_telemetry = self._get_latest_telemetry()
-        if latest_telemetry:
-            # Reduce temperatures and utilization across the board
-            for comp in latest_telemetry.components:
-                comp.temperature *= 0.9
-                comp.utilization *= 0.95
-            
-            for link in latest_telemetry.links:
-                link.error_rate *= 0.5
-                link.utilization *= 0.9
-            
-            self.score += 10  # Big reward for shield
-            print("   System-wide resilience boosted!")
+        # Reduce temperatures, utilization and errors across the board
+        self.simulator.apply_shield()
+        self.score += 10  # Big reward for shield
+        print("   System-wide resilience boosted!")
     
     def _get_latest_telemetry(self):
-        """Get latest telemetry data"""
-        try:
-            return self.sim_data_queue.get_nowait()
-        except queue.Empty:
-            return None
+        """Get latest telemetry data, building a frame only when the simulation has advanced"""
+        tick = self.simulator.time_step
+        if tick != self._telemetry_tick:
+            self._latest_telemetry = self.simulator.snapshot()
+            self._telemetry_tick = tick
+        return self._latest_telemetry
     
     def _main_loop(self):
         """Main visualization and interaction loop"""
         while True:
-            ret, frame = self.cap.read()
-            if not ret:
+            # Wait for the capture thread to deliver a new frame - with a timeout, so
+            # the keyboard is still polled while the camera stalls
+            got_frame = self._frame_ready.wait(timeout=FRAME_WAIT_S)
+            if not self.camera_running:
                 break
             
-            # Flip for mirror effect
-            frame = cv2.flip(frame, 1)
-            
-            # Recognize gesture
-            gesture_result = self.gesture_recognizer.recognize_gesture(frame)
-            
-            # Handle gesture actions
-            self._handle_gesture_action(gesture_result)
-            
-            # Get latest simulation data
-            latest_telemetry = self._get_latest_telemetry()
-            
-            # Draw visualization
-            self._draw_complete_visualization(frame, gesture_result, latest_telemetry)
-            
-            # Show frame
-            cv2.imshow('SynapseNet - Live Demo', frame)
+            if got_frame:
+                self._frame_ready.clear()
+                
+                # Flip for mirror effect
+                with self._frame_lock:
+                    frame = cv2.flip(self._frame_buf, 1, dst=self._flip_buf)
+                
+                # Recognize gesture
+                gesture_result = self.gesture_recognizer.recognize_gesture(frame)
+                
+                # Handle gesture actions
+                self._handle_gesture_action(gesture_result)
+                
+                # Get latest simulation data
+                latest_telemetry = self._get_latest_telemetry()
+                
+                # Draw visualization
+                self._draw_complete_visualization(frame, gesture_result, latest_telemetry)
+                
+                # Show frame
+                cv2.imshow('SynapseNet - Live Demo', frame)
             
             # Handle keyboard
-            key = cv2.waitKey(1) & 0xFF
+            key = _poll_key() & 0xFF
             if key == ord('q'):
                 break
     
@@ -289,12 +317,14 @@ class SynapseNetLiveDemo:
         """Draw complete visualization overlay"""
         height, width = frame.shape[:2]
         
-        # Main info panel (left side)
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (350, 300), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.8, frame, 0.2, 0, frame)
+        # Main info panel (left side) - covers (10, 10)-(350, 300) inclusive, clipped
+        # to the frame for cameras that deliver less than 640x480
+        panel = frame[10:301, 10:351]
+        if panel.size:
+            panel_h, panel_w = panel.shape[:2]
+            cv2.addWeighted(self._panel_bg[:panel_h, :panel_w], 0.8, panel, 0.2, 0, dst=panel)
         
-        font = cv2.FONT_HERSHEY_SIMPLEX
+        font = self.FONT
         
         # Title
         cv2.putText(frame, "SynapseNet Live Demo", (20, 35), font, 0.8, (0, 255, 255), 2)
@@ -314,15 +344,17 @@ class SynapseNetLiveDemo:
         
         # System status
         if telemetry:
-            healthy_comps = sum(1 for c in telemetry.components if c.status == ComponentStatus.HEALTHY)
+            metrics = telemetry.system_metrics
+            healthy_comps = metrics.get('healthy_components', 0)
             total_comps = len(telemetry.components)
+            avg_temp = metrics.get('avg_temperature_c', 0)
+            avg_util = metrics.get('avg_utilization', 0)
+            
             cv2.putText(frame, f"Components: {healthy_comps}/{total_comps}", (20, 210), font, 0.5, (255, 255, 255), 1)
             
-            avg_temp = telemetry.system_metrics.get('avg_temperature_c', 0)
             temp_color = (0, 255, 0) if avg_temp < 60 else (0, 255, 255) if avg_temp < 80 else (0, 0, 255)
             cv2.putText(frame, f"Avg Temp: {avg_temp:.1f}°C", (20, 235), font, 0.5, temp_color, 1)
             
-            avg_util = telemetry.system_metrics.get('avg_utilization', 0)
             util_color = (0, 255, 0) if avg_util < 70 else (0, 255, 255) if avg_util < 90 else (0, 0, 255)
             cv2.putText(frame, f"Avg Util: {avg_util:.1f}%", (20, 260), font, 0.5, util_color, 1)
         
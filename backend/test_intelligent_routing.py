@@ -6,18 +6,33 @@ Demonstrates smart rerouting decisions when links fail or become congested.
 Shows AI making intelligent network optimization decisions in real-time.
 """
 
+import os
 import time
+import traceback
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from optimize.rules import IntelligentRouter, RouteQuality
 from schemas import (
     TelemetryFrame, HardwareComponent, Link, ComponentType, 
     LinkType, ComponentStatus
 )
+# The router (and its Numba route kernels) is imported inside each test so
+# loading this module stays cheap
+
+# Set QUIET=1 to silence progress output (e.g. when timing the suite)
+_p = (lambda *args, **kwargs: None) if os.environ.get("QUIET") else print
+
+# Rerouting scenarios for test_performance_statistics:
+# (link_id, utilization or status, latency_ms, description)
+_REROUTE_SCENARIOS = (
+    ("cpu1_mem1", 95.0, 20.0, "High congestion"),
+    ("cpu1_gpu1", 90.0, 12.0, "Moderate congestion"),
+    ("cpu2_mem2", ComponentStatus.FAILED, 0.0, "Link failure")
+)
 
 
 def create_complex_network() -> TelemetryFrame:
@@ -133,200 +148,206 @@ def create_complex_network() -> TelemetryFrame:
     )
 
 
+@lru_cache(maxsize=1)
+def base_network() -> TelemetryFrame:
+    """Network shared by all tests, built on first use - tests mutate snapshots of it"""
+    return create_complex_network()
+
+
 def test_route_discovery():
     """Test route discovery and quality assessment"""
-    print("🔍 Testing Route Discovery")
-    print("=" * 40)
+    _p("🔍 Testing Route Discovery")
+    _p("=" * 40)
+    
+    from optimize.rules import IntelligentRouter
     
     router = IntelligentRouter()
-    network = create_complex_network()
+    network = base_network().snapshot()
     
     # Find all routes from CPU1 to Memory1
     routes = router.find_all_routes("cpu1", "mem1", network)
     
-    print(f"Found {len(routes)} routes from CPU1 to Memory1:")
+    _p(f"Found {len(routes)} routes from CPU1 to Memory1:")
     for i, route in enumerate(routes[:5]):  # Show top 5
         path_str = " → ".join(route.path)
-        print(f"  {i+1}. {path_str}")
-        print(f"     Latency: {route.total_latency:.1f}ms, "
-              f"Bandwidth: {route.min_bandwidth:.0f}GB/s, "
-              f"Quality: {route.quality.value}")
+        _p(f"  {i+1}. {path_str}")
+        _p(f"     Latency: {route.total_latency:.1f}ms, "
+           f"Bandwidth: {route.min_bandwidth:.0f}GB/s, "
+           f"Quality: {route.quality.value}")
     
     # Find routes from CPU1 to GPU2 (cross-connections)
-    print(f"\nRoutes from CPU1 to GPU2:")
+    _p(f"\nRoutes from CPU1 to GPU2:")
     routes = router.find_all_routes("cpu1", "gpu2", network)
     for i, route in enumerate(routes[:3]):
         path_str = " → ".join(route.path)
-        print(f"  {i+1}. {path_str}")
-        print(f"     Latency: {route.total_latency:.1f}ms, "
-              f"Quality: {route.quality.value}")
+        _p(f"  {i+1}. {path_str}")
+        _p(f"     Latency: {route.total_latency:.1f}ms, "
+           f"Quality: {route.quality.value}")
 
 
 def test_network_analysis():
     """Test network health analysis"""
-    print("\n\n📊 Testing Network Analysis")
-    print("=" * 40)
+    _p("\n\n📊 Testing Network Analysis")
+    _p("=" * 40)
+    
+    from optimize.rules import IntelligentRouter
     
     router = IntelligentRouter()
-    network = create_complex_network()
+    network = base_network().snapshot()
     
     # Analyze healthy network
     analysis = router.analyze_network_health(network)
-    print("Healthy Network Analysis:")
-    print(f"  Components: {analysis['healthy_components']}/{analysis['total_components']} healthy")
-    print(f"  Links: {analysis['healthy_links']}/{analysis['total_links']} healthy")
-    print(f"  Avg Latency: {analysis['avg_latency']:.1f}ms")
-    print(f"  Avg Utilization: {analysis['avg_utilization']:.1f}%")
-    print(f"  Bottlenecks: {len(analysis['bottlenecks'])}")
+    _p("Healthy Network Analysis:")
+    _p(f"  Components: {analysis['healthy_components']}/{analysis['total_components']} healthy")
+    _p(f"  Links: {analysis['healthy_links']}/{analysis['total_links']} healthy")
+    _p(f"  Avg Latency: {analysis['avg_latency']:.1f}ms")
+    _p(f"  Avg Utilization: {analysis['avg_utilization']:.1f}%")
+    _p(f"  Bottlenecks: {len(analysis['bottlenecks'])}")
     
     # Introduce congestion
-    print("\n💥 Introducing Network Congestion...")
-    for link in network.links:
-        if link.id == "cpu1_mem1":
-            link.utilization = 95.0  # Heavy congestion
-            link.latency_ms = 15.0   # High latency
-        elif link.id == "cpu1_gpu1":
-            link.utilization = 90.0  # Moderate congestion
+    _p("\n💥 Introducing Network Congestion...")
+    links = {link.id: link for link in network.links}
+    links["cpu1_mem1"].utilization = 95.0  # Heavy congestion
+    links["cpu1_mem1"].latency_ms = 15.0   # High latency
+    links["cpu1_gpu1"].utilization = 90.0  # Moderate congestion
     
     analysis = router.analyze_network_health(network)
-    print("Congested Network Analysis:")
-    print(f"  Congested Links: {analysis['congested_links']}")
-    print(f"  Bottlenecks: {len(analysis['bottlenecks'])}")
+    _p("Congested Network Analysis:")
+    _p(f"  Congested Links: {analysis['congested_links']}")
+    _p(f"  Bottlenecks: {len(analysis['bottlenecks'])}")
     for bottleneck in analysis['bottlenecks']:
-        print(f"    - {bottleneck['link_id']}: {bottleneck['issue']} "
-              f"(util: {bottleneck.get('utilization_pct', 0):.1f}%, "
-              f"latency: {bottleneck.get('latency_ms', 0):.1f}ms)")
+        _p(f"    - {bottleneck['link_id']}: {bottleneck['issue']} "
+           f"(util: {bottleneck.get('utilization_pct', 0):.1f}%, "
+           f"latency: {bottleneck.get('latency_ms', 0):.1f}ms)")
 
 
 def test_intelligent_rerouting():
     """Test intelligent rerouting suggestions"""
-    print("\n\n🧠 Testing Intelligent Rerouting")
-    print("=" * 40)
+    _p("\n\n🧠 Testing Intelligent Rerouting")
+    _p("=" * 40)
+    
+    from optimize.rules import IntelligentRouter
     
     router = IntelligentRouter()
-    network = create_complex_network()
+    network = base_network().snapshot()
     
     # Create congestion scenario
-    print("Creating congestion on CPU1-Memory1 link...")
-    for link in network.links:
-        if link.id == "cpu1_mem1":
-            link.utilization = 95.0
-            link.latency_ms = 20.0
+    _p("Creating congestion on CPU1-Memory1 link...")
+    links = {link.id: link for link in network.links}
+    links["cpu1_mem1"].utilization = 95.0
+    links["cpu1_mem1"].latency_ms = 20.0
     
     # Get rerouting suggestions
     suggestions = router.suggest_reroutes(network)
     
-    print(f"\nFound {len(suggestions)} rerouting suggestions:")
+    _p(f"\nFound {len(suggestions)} rerouting suggestions:")
     for i, suggestion in enumerate(suggestions):
-        print(f"\n  Suggestion {i+1}:")
-        print(f"    Route: {suggestion.source_id} → {suggestion.target_id}")
-        print(f"    Reason: {suggestion.reason}")
+        _p(f"\n  Suggestion {i+1}:")
+        _p(f"    Route: {suggestion.source_id} → {suggestion.target_id}")
+        _p(f"    Reason: {suggestion.reason}")
         
         if suggestion.old_route:
             old_path = " → ".join(suggestion.old_route.path)
-            print(f"    Old Path: {old_path} ({suggestion.old_route.total_latency:.1f}ms)")
+            _p(f"    Old Path: {old_path} ({suggestion.old_route.total_latency:.1f}ms)")
         
         new_path = " → ".join(suggestion.new_route.path)
-        print(f"    New Path: {new_path} ({suggestion.new_route.total_latency:.1f}ms)")
+        _p(f"    New Path: {new_path} ({suggestion.new_route.total_latency:.1f}ms)")
         
-        print(f"    Expected Improvements:")
+        _p(f"    Expected Improvements:")
         for metric, value in suggestion.expected_improvement.items():
-            print(f"      {metric}: {value:+.1f}%")
+            _p(f"      {metric}: {value:+.1f}%")
     
     # Execute rerouting
     if suggestions:
-        print(f"\n⚡ Executing rerouting...")
+        _p(f"\n⚡ Executing rerouting...")
         for suggestion in suggestions:
             success = router.execute_reroute(suggestion)
             if success:
-                print(f"    ✅ Rerouted {suggestion.source_id} → {suggestion.target_id}")
+                _p(f"    ✅ Rerouted {suggestion.source_id} → {suggestion.target_id}")
             else:
                 print(f"    ❌ Failed to reroute {suggestion.source_id} → {suggestion.target_id}")
 
 
 def test_failure_recovery():
     """Test recovery from link failures"""
-    print("\n\n🚨 Testing Failure Recovery")
-    print("=" * 40)
+    _p("\n\n🚨 Testing Failure Recovery")
+    _p("=" * 40)
+    
+    from optimize.rules import IntelligentRouter
     
     router = IntelligentRouter()
-    network = create_complex_network()
+    network = base_network().snapshot()
     
     # Simulate link failure
-    print("Simulating failure of CPU1-Memory1 direct link...")
-    for link in network.links:
-        if link.id == "cpu1_mem1":
-            link.status = ComponentStatus.FAILED
+    _p("Simulating failure of CPU1-Memory1 direct link...")
+    links = {link.id: link for link in network.links}
+    links["cpu1_mem1"].status = ComponentStatus.FAILED
     
     # Find alternative routes
     routes = router.find_all_routes("cpu1", "mem1", network)
-    print(f"\nAlternative routes after failure:")
+    _p(f"\nAlternative routes after failure:")
     for i, route in enumerate(routes[:3]):
         path_str = " → ".join(route.path)
-        print(f"  {i+1}. {path_str}")
-        print(f"     Latency: {route.total_latency:.1f}ms, "
-              f"Quality: {route.quality.value}")
+        _p(f"  {i+1}. {path_str}")
+        _p(f"     Latency: {route.total_latency:.1f}ms, "
+           f"Quality: {route.quality.value}")
     
     # Get rerouting suggestions
     suggestions = router.suggest_reroutes(network)
-    print(f"\nFailure recovery suggestions: {len(suggestions)}")
+    _p(f"\nFailure recovery suggestions: {len(suggestions)}")
     for suggestion in suggestions:
-        print(f"  - Reroute via: {' → '.join(suggestion.new_route.path)}")
-        print(f"    Reason: {suggestion.reason}")
+        _p(f"  - Reroute via: {' → '.join(suggestion.new_route.path)}")
+        _p(f"    Reason: {suggestion.reason}")
 
 
 def test_performance_statistics():
     """Test rerouting performance statistics"""
-    print("\n\n📈 Testing Performance Statistics")
-    print("=" * 40)
+    _p("\n\n📈 Testing Performance Statistics")
+    _p("=" * 40)
+    
+    from optimize.rules import IntelligentRouter
     
     router = IntelligentRouter()
-    network = create_complex_network()
+    network = base_network().snapshot()
     
     # Simulate multiple rerouting scenarios
-    scenarios = [
-        ("cpu1_mem1", 95.0, 20.0, "High congestion"),
-        ("cpu1_gpu1", 90.0, 12.0, "Moderate congestion"),
-        ("cpu2_mem2", ComponentStatus.FAILED, 0.0, "Link failure")
-    ]
-    
-    for link_id, util_or_status, latency, description in scenarios:
-        print(f"\nScenario: {description}")
+    links = {link.id: link for link in network.links}
+    for link_id, util_or_status, latency, description in _REROUTE_SCENARIOS:
+        _p(f"\nScenario: {description}")
         
         # Apply scenario
-        for link in network.links:
-            if link.id == link_id:
-                if isinstance(util_or_status, float):
-                    link.utilization = util_or_status
-                    link.latency_ms = latency
-                else:
-                    link.status = util_or_status
+        link = links[link_id]
+        if isinstance(util_or_status, float):
+            link.utilization = util_or_status
+            link.latency_ms = latency
+        else:
+            link.status = util_or_status
         
         # Get and execute suggestions
         suggestions = router.suggest_reroutes(network)
         for suggestion in suggestions:
             router.execute_reroute(suggestion)
-            print(f"  Executed: {suggestion.source_id} → {suggestion.target_id}")
+            _p(f"  Executed: {suggestion.source_id} → {suggestion.target_id}")
     
     # Show statistics
     stats = router.get_reroute_statistics()
-    print(f"\n📊 Rerouting Statistics:")
-    print(f"  Total Reroutes: {stats['total_reroutes']}")
-    print(f"  Avg Latency Improvement: {stats['avg_latency_improvement']:.1f}%")
-    print(f"  Success Rate: {stats['success_rate']:.1f}%")
+    _p(f"\n📊 Rerouting Statistics:")
+    _p(f"  Total Reroutes: {stats['total_reroutes']}")
+    _p(f"  Avg Latency Improvement: {stats['avg_latency_improvement']:.1f}%")
+    _p(f"  Success Rate: {stats['success_rate']:.1f}%")
     
-    print(f"\n  Most Common Reasons:")
+    _p(f"\n  Most Common Reasons:")
     for reason, count in stats['most_common_reasons'].items():
-        print(f"    - {reason}: {count} times")
+        _p(f"    - {reason}: {count} times")
     
-    print(f"\n  Recent Actions:")
+    _p(f"\n  Recent Actions:")
     for action in stats['recent_actions']:
-        print(f"    - {action['route']}: {action['reason']}")
+        _p(f"    - {action['route']}: {action['reason']}")
 
 
 if __name__ == "__main__":
-    print("🚀 SynapseNet Intelligent Routing Test Suite")
-    print("=" * 60)
+    _p("🚀 SynapseNet Intelligent Routing Test Suite")
+    _p("=" * 60)
     
     try:
         test_route_discovery()
@@ -335,16 +356,17 @@ if __name__ == "__main__":
         test_failure_recovery()
         test_performance_statistics()
         
-        print("\n✅ All intelligent routing tests completed successfully!")
-        print("\n🎯 Key Features Demonstrated:")
-        print("  ✓ Multi-path route discovery")
-        print("  ✓ Network health analysis")
-        print("  ✓ Intelligent congestion detection")
-        print("  ✓ Automatic rerouting suggestions")
-        print("  ✓ Failure recovery mechanisms")
-        print("  ✓ Performance tracking and statistics")
+        _p("\n✅ All intelligent routing tests completed successfully!")
+        _p("\n🎯 Key Features Demonstrated:")
+        _p("  ✓ Multi-path route discovery")
+        _p("  ✓ Network health analysis")
+        _p("  ✓ Intelligent congestion detection")
+        _p("  ✓ Automatic rerouting suggestions")
+        _p("  ✓ Failure recovery mechanisms")
+        _p("  ✓ Performance tracking and statistics")
         
     except Exception as e:
-        print(f"\n❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        sys.stderr.write(f"\n❌ Test failed: {''.join(traceback.format_exception_only(e))}")
+        if os.environ.get("NODECOMM_TRACE"):  # set for the full traceback
+            raise
+        sys.exit(1)
@@ -6,9 +6,15 @@ Demonstrates real-time scoring, metrics tracking, and insight generation
 for both Learning Mode and Chaos Mode scenarios.
 """
 
+import os
 import time
+import traceback
 import sys
 from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -19,11 +25,26 @@ from schemas import (
     LinkType, ComponentStatus, TelemetryFrame, Scorecard
 )
 
+# Set QUIET=1 to silence progress output (e.g. when timing the suite)
+_p = (lambda *args, **kwargs: None) if os.environ.get("QUIET") else print
+
+
+def pct_change(new, old):
+    """Percent change from old to new, elementwise; 0 where old is not positive"""
+    new, old = np.asarray(new, dtype=np.float64), np.asarray(old, dtype=np.float64)
+    valid = old > 0
+    return np.where(valid, (new - old) / np.where(valid, old, 1.0) * 100, 0.0)
 
-def create_test_system() -> SystemState:
-    """Create a test hardware system"""
+
+@lru_cache(maxsize=1)
+def _master_system() -> SystemState:
+    """Build the test hardware system once
+    
+    The fixture data is known-valid, so models are built with model_construct
+    (no validation pass).
+    """
     components = {
-        "cpu1": HardwareComponent(
+        "cpu1": HardwareComponent.model_construct(
             id="cpu1",
             name="Intel Xeon CPU",
             component_type=ComponentType.CPU,
@@ -32,7 +53,7 @@ def create_test_system() -> SystemState:
             temperature=65.0,
             power_draw=150.0
         ),
-        "gpu1": HardwareComponent(
+        "gpu1": HardwareComponent.model_construct(
             id="gpu1", 
             name="NVIDIA A100",
             component_type=ComponentType.GPU,
@@ -41,7 +62,7 @@ def create_test_system() -> SystemState:
             temperature=75.0,
             power_draw=400.0
         ),
-        "mem1": HardwareComponent(
+        "mem1": HardwareComponent.model_construct(
             id="mem1",
             name="DDR4 Memory",
             component_type=ComponentType.MEMORY,
@@ -53,7 +74,7 @@ def create_test_system() -> SystemState:
     }
     
     links = {
-        "cpu_mem": Link(
+        "cpu_mem": Link.model_construct(
             id="cpu_mem",
             name="CPU-Memory Link",
             source_id="cpu1",
@@ -64,7 +85,7 @@ def create_test_system() -> SystemState:
             utilization=0.6,
             status=ComponentStatus.HEALTHY
         ),
-        "cpu_gpu": Link(
+        "cpu_gpu": Link.model_construct(
             id="cpu_gpu", 
             name="CPU-GPU Link",
             source_id="cpu1",
@@ -78,178 +99,205 @@ def create_test_system() -> SystemState:
     }
     
     # Create telemetry frame
-    telemetry = TelemetryFrame(
+    telemetry = TelemetryFrame.model_construct(
         timestamp=time.time(),
         components=list(components.values()),
         links=list(links.values())
     )
     
     # Create initial scorecard
-    scorecard = Scorecard()
+    scorecard = Scorecard.model_construct()
     
-    return SystemState(
+    return SystemState.model_construct(
         telemetry=telemetry,
         scorecard=scorecard
     )
 
 
+def create_test_system() -> Tuple[SystemState, Dict[str, HardwareComponent], Dict[str, Link]]:
+    """Create a test hardware system, plus id -> model indexes for scenario edits
+    
+    Each call returns a deep copy of the cached master, so scenarios can
+    mutate it freely.
+    """
+    system = _master_system().model_copy(deep=True)
+    components = {comp.id: comp for comp in system.telemetry.components}
+    links = {link.id: link for link in system.telemetry.links}
+    return system, components, links
+
+
 def test_chaos_mode_scenario():
     """Test Chaos Mode scoring and metrics"""
-    print("🎮 Testing Chaos Mode Scenario")
-    print("=" * 50)
+    _p("🎮 Testing Chaos Mode Scenario")
+    _p("=" * 50)
     
-    scorecard = KPIScorecard(mode=GameMode.CHAOS)
-    system = create_test_system()
+    # Simulated clock - advanced explicitly instead of sleeping. Starts at 0
+    # like a monotonic counter; attack_time and response times come from it.
+    now = [0.0]
+    scorecard = KPIScorecard(mode=GameMode.CHAOS, clock=lambda: now[0])
+    system, components, _ = create_test_system()
+    gpu = components["gpu1"]
     
     # Initial healthy state
     scorecard.update_system_state(system)
-    print(f"Initial Resilience: {scorecard.metrics.resilience_score:.1f}%")
-    print(f"Initial Latency: {scorecard.metrics.avg_latency:.1f}ms")
-    print(f"Initial Bandwidth: {scorecard.metrics.total_bandwidth:.1f} GB/s")
+    _p(f"Initial Resilience: {scorecard.metrics.resilience_score:.1f}%")
+    _p(f"Initial Latency: {scorecard.metrics.avg_latency:.1f}ms")
+    _p(f"Initial Bandwidth: {scorecard.metrics.total_bandwidth:.1f} GB/s")
     
     # Simulate AI attack - GPU failure
-    print("\n💥 AI Attack: GPU Overheating!")
-    attack_time = time.time()
-    # Find GPU component and modify it
-    for comp in system.telemetry.components:
-        if comp.id == "gpu1":
-            comp.status = ComponentStatus.FAILED
-            comp.temperature = 95.0
+    _p("\n💥 AI Attack: GPU Overheating!")
+    attack_time = now[0]
+    gpu.status = ComponentStatus.FAILED
+    gpu.temperature = 95.0
     
     scorecard.update_system_state(system)
-    print(f"Post-attack Resilience: {scorecard.metrics.resilience_score:.1f}%")
+    _p(f"Post-attack Resilience: {scorecard.metrics.resilience_score:.1f}%")
     
     # User responds with heal action
-    time.sleep(1.5)  # Simulate response delay
-    print("\n✊ User Action: HEAL GPU")
+    now[0] += 1.5  # Simulate response delay
+    _p("\n✊ User Action: HEAL GPU")
     action = scorecard.record_user_action("heal", "gpu1", attack_time)
-    print(f"Action Effectiveness: {action.effectiveness:.1%}")
-    print(f"Response Time: {action.response_time:.1f}s")
-    print(f"Score Bonus: +{scorecard.metrics.user_score}")
+    _p(f"Action Effectiveness: {action.effectiveness:.1%}")
+    _p(f"Response Time: {action.response_time:.1f}s")
+    _p(f"Score Bonus: +{scorecard.metrics.user_score}")
     
     # System recovers
-    for comp in system.telemetry.components:
-        if comp.id == "gpu1":
-            comp.status = ComponentStatus.HEALTHY
-            comp.temperature = 75.0
+    gpu.status = ComponentStatus.HEALTHY
+    gpu.temperature = 75.0
     scorecard.update_system_state(system)
-    print(f"Post-heal Resilience: {scorecard.metrics.resilience_score:.1f}%")
+    _p(f"Post-heal Resilience: {scorecard.metrics.resilience_score:.1f}%")
     
     # Show recent insights
-    print("\n💡 Recent Insights:")
-    for insight in scorecard.get_recent_insights(3):
-        print(f"  {insight.message}")
+    _p("\n💡 Recent Insights:")
+    messages = scorecard.get_recent_insight_messages(3)
+    if messages:
+        _p("\n".join(f"  {message}" for message in messages))
     
     # Generate session summary
-    print("\n📊 Session Summary:")
+    _p("\n📊 Session Summary:")
     summary = scorecard.generate_session_summary()
-    print(f"  Final Score: {summary['final_score']}")
-    print(f"  Success Rate: {summary['success_rate']:.1f}%")
-    print(f"  Performance Grade: {summary['performance_grade']}")
+    _p(f"  Final Score: {summary['final_score']}")
+    _p(f"  Success Rate: {summary['success_rate']:.1f}%")
+    _p(f"  Performance Grade: {summary['performance_grade']}")
 
 
 def test_learning_mode_scenario():
     """Test Learning Mode metrics and insights"""
-    print("\n\n📚 Testing Learning Mode Scenario")
-    print("=" * 50)
+    _p("\n\n📚 Testing Learning Mode Scenario")
+    _p("=" * 50)
     
-    scorecard = KPIScorecard(mode=GameMode.LEARNING)
-    system = create_test_system()
+    now = [time.time()]
+    scorecard = KPIScorecard(mode=GameMode.LEARNING, clock=lambda: now[0])
+    system, _, links = create_test_system()
+    cpu_mem_link = links["cpu_mem"]
     
     # Simulate user moving components and observing effects
-    print("User moves CPU away from Memory...")
+    _p("User moves CPU away from Memory...")
     
     # Baseline metrics
     scorecard.update_system_state(system)
     baseline_latency = scorecard.metrics.avg_latency
-    print(f"Baseline CPU-Memory Latency: {baseline_latency:.1f}ms")
+    _p(f"Baseline CPU-Memory Latency: {baseline_latency:.1f}ms")
     
     # Simulate increased latency due to distance
-    time.sleep(0.5)
-    for link in system.telemetry.links:
-        if link.id == "cpu_mem":
-            link.latency_ms = 15.0  # Increased due to distance
+    now[0] += 0.5
+    cpu_mem_link.latency_ms = 15.0  # Increased due to distance
     scorecard.update_system_state(system)
     
     new_latency = scorecard.metrics.avg_latency
-    print(f"New CPU-Memory Latency: {new_latency:.1f}ms")
-    print(f"Performance Impact: {((new_latency - baseline_latency) / baseline_latency * 100):+.1f}%")
+    _p(f"New CPU-Memory Latency: {new_latency:.1f}ms")
+    _p(f"Performance Impact: {float(pct_change(new_latency, baseline_latency)):+.1f}%")
     
     # Show educational insights
-    print("\n💡 Learning Insights:")
-    for insight in scorecard.get_recent_insights(3):
-        print(f"  {insight.message}")
+    _p("\n💡 Learning Insights:")
+    messages = scorecard.get_recent_insight_messages(3)
+    if messages:
+        _p("\n".join(f"  {message}" for message in messages))
     
     # Show performance trend
-    print("\n📈 Performance Trend (last 60s):")
+    _p("\n📈 Performance Trend (last 60s):")
     trend = scorecard.get_performance_trend("latency", 60)
     if len(trend) >= 2:
-        start_val = trend[0][1]
-        end_val = trend[-1][1]
-        change = ((end_val - start_val) / start_val * 100) if start_val > 0 else 0
-        print(f"  Latency change: {change:+.1f}% over {len(trend)} measurements")
+        values = np.fromiter((value for _, value in trend), dtype=np.float64, count=len(trend))
+        change = float(pct_change(values[-1], values[0]))
+        _p(f"  Latency change: {change:+.1f}% over {len(trend)} measurements")
 
 
 def test_performance_tracking():
     """Test performance tracking and trend analysis"""
-    print("\n\n📊 Testing Performance Tracking")
-    print("=" * 50)
+    _p("\n\n📊 Testing Performance Tracking")
+    _p("=" * 50)
+    
+    now = [time.time()]
+    scorecard = KPIScorecard(mode=GameMode.CHAOS, clock=lambda: now[0])
+    system, components, links = create_test_system()
     
-    scorecard = KPIScorecard(mode=GameMode.CHAOS)
-    system = create_test_system()
+    comp_list, link_list = list(components.values()), list(links.values())
+    metrics = scorecard.get_current_metrics()  # updated in place by every update_system_state
+    
+    # Gradually degrade system - whole schedule computed up front, one row per
+    # step and one column per component/link: CPU load, GPU heat and CPU-memory
+    # latency ramp up, everything else holds its starting value
+    degradation = np.arange(10)[:, None] * 0.1
+    util_ramp = np.array([{"cpu1": 30.0}.get(c.id, 0.0) for c in comp_list])
+    temp_ramp = np.array([{"gpu1": 10.0}.get(c.id, 0.0) for c in comp_list])
+    latency_ramp = np.array([{"cpu_mem": 5.0}.get(l.id, 0.0) for l in link_list])
+    base_util = np.array([c.utilization for c in comp_list])
+    base_temp = np.array([c.temperature for c in comp_list])
+    base_latency = np.array([l.latency_ms for l in link_list])
+    
+    util = np.minimum(100, base_util + degradation * util_ramp).tolist()
+    temp = np.minimum(95, base_temp + degradation * temp_ramp).tolist()
+    latency = (base_latency + degradation * latency_ramp).tolist()
     
     # Simulate multiple system updates over time
-    print("Simulating 10 seconds of system operation...")
+    _p("Simulating 10 seconds of system operation...")
     
     for i in range(10):
-        # Gradually degrade system
-        degradation = i * 0.1
-        for comp in system.telemetry.components:
-            if comp.id == "cpu1":
-                comp.utilization = min(100, 45 + degradation * 30)
-            elif comp.id == "gpu1":
-                comp.temperature = min(95, 75 + degradation * 10)
-        
-        for link in system.telemetry.links:
-            if link.id == "cpu_mem":
-                link.latency_ms = 2.5 + degradation * 5
+        # Models don't validate on assignment - write their fields directly,
+        # the same way the simulator syncs its arrays
+        for comp, comp_util, comp_temp in zip(comp_list, util[i], temp[i]):
+            comp.__dict__.update(utilization=comp_util, temperature=comp_temp)
+        for link, link_latency in zip(link_list, latency[i]):
+            link.__dict__["latency_ms"] = link_latency
         
         scorecard.update_system_state(system)
         
         if i % 3 == 0:  # Every 3rd iteration, show current state
-            print(f"  t={i}s: Resilience={scorecard.metrics.resilience_score:.1f}%, "
-                  f"Latency={scorecard.metrics.avg_latency:.1f}ms")
+            resilience, avg_latency, _, _ = metrics.snapshot()
+            _p(f"  t={i}s: Resilience={resilience:.1f}%, Latency={avg_latency:.1f}ms")
         
-        time.sleep(0.2)  # Small delay to simulate real-time
+        now[0] += 0.2  # Advance simulated time
     
     # Show final metrics
-    metrics = scorecard.get_current_metrics()
-    print(f"\nFinal Metrics:")
-    print(f"  Resilience: {metrics.resilience_score:.1f}%")
-    print(f"  Uptime: {metrics.uptime_percentage:.1f}%")
-    print(f"  Avg Latency: {metrics.avg_latency:.1f}ms")
-    print(f"  Efficiency: {metrics.efficiency_score:.1f}%")
-    print(f"  Total Failures: {metrics.total_failures}")
+    resilience, avg_latency, uptime, efficiency = metrics.snapshot()
+    _p(f"\nFinal Metrics:")
+    _p(f"  Resilience: {resilience:.1f}%")
+    _p(f"  Uptime: {uptime:.1f}%")
+    _p(f"  Avg Latency: {avg_latency:.1f}ms")
+    _p(f"  Efficiency: {efficiency:.1f}%")
+    _p(f"  Total Failures: {metrics.total_failures}")
 
 
 if __name__ == "__main__":
-    print("🚀 SynapseNet KPI Scorecard Test Suite")
-    print("=" * 60)
+    _p("🚀 SynapseNet KPI Scorecard Test Suite")
+    _p("=" * 60)
     
     try:
         test_chaos_mode_scenario()
         test_learning_mode_scenario() 
         test_performance_tracking()
         
-        print("\n✅ All KPI tests completed successfully!")
-        print("\n🎯 Key Features Demonstrated:")
-        print("  ✓ Real-time resilience scoring")
-        print("  ✓ User action effectiveness tracking")
-        print("  ✓ Educational insight generation")
-        print("  ✓ Performance trend analysis")
-        print("  ✓ Session summary and grading")
+        _p("\n✅ All KPI tests completed successfully!")
+        _p("\n🎯 Key Features Demonstrated:")
+        _p("  ✓ Real-time resilience scoring")
+        _p("  ✓ User action effectiveness tracking")
+        _p("  ✓ Educational insight generation")
+        _p("  ✓ Performance trend analysis")
+        _p("  ✓ Session summary and grading")
         
     except Exception as e:
-        print(f"\n❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        sys.stderr.write(f"\n❌ Test failed: {''.join(traceback.format_exception_only(e))}")
+        if os.environ.get("NODECOMM_TRACE"):  # set for the full traceback
+            raise
+        sys.exit(1)
@@ -6,7 +6,8 @@ Tests the hand tracking functionality without the full server
 
 import sys
 import os
-import time
+import threading
+import queue
 import json
 
 # Add backend directory to path
@@ -15,8 +16,34 @@ sys.path.append(os.path.dirname(__file__))
 from learn_mode_cv import LearnModeHandTracker, LearnModeCVResult
 
 
+# Latest result waiting to be printed - the camera thread only ever enqueues
+_results = queue.Queue(maxsize=1)
+
+
 def test_callback(result: LearnModeCVResult):
-    """Test callback to receive hand tracking data"""
+    """Test callback to receive hand tracking data (runs on the camera thread)"""
+    try:
+        _results.put_nowait(result)
+    except queue.Full:
+        # Printer is behind - replace the stale result with this one
+        try:
+            _results.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            _results.put_nowait(result)
+        except queue.Full:
+            pass
+
+
+def _printer():
+    """Print hand tracking results off the camera thread"""
+    while True:
+        print_result(_results.get())
+
+
+def print_result(result: LearnModeCVResult):
+    """Print one hand tracking update"""
     print(f"\n🖐️ Hand Tracking Update:")
     print(f"   📊 Processing time: {result.processing_time_ms:.1f}ms")
     print(f"   📐 Frame: {result.frame_width}x{result.frame_height}")
@@ -47,7 +74,9 @@ def main():
     try:
         # Start camera with test callback
         print("\n📹 Starting camera...")
-        if not tracker.start_camera(test_callback):
+        threading.Thread(target=_printer, daemon=True).start()
+        status_event = threading.Event()  # set by the tracker every 150 frames
+        if not tracker.start_camera(test_callback, status_event):
             print("❌ Failed to start camera!")
             return
         
@@ -58,13 +87,11 @@ def main():
         print("   - Press Ctrl+C to stop")
         print("\n" + "=" * 50)
         
-        # Keep running until interrupted
+        # Keep running until interrupted, showing status every 150 frames (~5 seconds)
         while True:
-            time.sleep(1)
-            
-            # Show status every 5 seconds
-            status = tracker.get_camera_status()
-            if status['frame_count'] > 0 and status['frame_count'] % 150 == 0:
+            if status_event.wait(timeout=5.0):
+                status_event.clear()
+                status = tracker.get_camera_status()
                 print(f"\n📊 Status: {status['fps']:.1f} FPS, {status['frame_count']} frames processed")
     
     except KeyboardInterrupt:
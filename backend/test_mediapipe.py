@@ -3,6 +3,37 @@
 Test MediaPipe installation and basic functionality.
 """
 
+import atexit
+
+# Hands instances shared across tests, keyed on their settings - loading the
+# hand landmark model is a fixed cost worth paying once. Closed at exit.
+_hands_cache = {}
+
+
+def _get_hands(static_image_mode, max_num_hands, min_detection_confidence, min_tracking_confidence):
+    """Return a shared MediaPipe Hands instance for these settings"""
+    key = (static_image_mode, max_num_hands, min_detection_confidence, min_tracking_confidence)
+    hands = _hands_cache.get(key)
+    if hands is None:
+        import mediapipe as mp
+        
+        if not _hands_cache:
+            atexit.register(_close_hands)
+        hands = _hands_cache[key] = mp.solutions.hands.Hands(
+            static_image_mode=static_image_mode,
+            max_num_hands=max_num_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+    return hands
+
+
+def _close_hands():
+    for hands in _hands_cache.values():
+        hands.close()
+    _hands_cache.clear()
+
+
 def test_imports():
     """Test if all required packages can be imported"""
     print("🔍 Testing imports...")
@@ -35,11 +66,8 @@ def test_mediapipe_hands():
     print("\n🖐️ Testing MediaPipe Hands...")
     
     try:
-        import mediapipe as mp
-        
-        # Initialize MediaPipe hands
-        mp_hands = mp.solutions.hands
-        hands = mp_hands.Hands(
+        # Initialize MediaPipe hands (shared instance, closed at exit)
+        _get_hands(
             static_image_mode=False,
             max_num_hands=2,
             min_detection_confidence=0.7,
@@ -47,7 +75,6 @@ def test_mediapipe_hands():
         )
         
         print("✅ MediaPipe Hands initialized successfully!")
-        hands.close()
         return True
         
     except Exception as e:
@@ -4,168 +4,175 @@ Command-line test script for SynapseNet hardware simulation.
 Run this to verify the basic simulation is working.
 """
 
+import os
 import sys
 import time
-import json
+import traceback
 from pathlib import Path
 
 # Add src to path so we can import our modules
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from providers.sim import HardwareSimulator
 from schemas import ComponentStatus
 
+# Set QUIET=1 to silence progress output (e.g. when timing the suite)
+_p = (lambda *args, **kwargs: None) if os.environ.get("QUIET") else print
+
+# Table headers for print_component_status / print_link_status
+_COMP_HEADER = (f"{'ID':<12} {'Name':<20} {'Type':<8} {'Util%':<6} {'Temp°C':<7} {'Power W':<8} {'Status'}\n"
+                + '-' * 70)
+_LINK_HEADER = (f"{'ID':<15} {'Source':<8} {'Target':<8} {'Type':<6} {'Util%':<6} {'Lat ms':<7} {'BW Gbps':<8} {'Err%':<6}\n"
+                + '-' * 75)
+
 
 def print_separator(title: str):
     """Print a nice separator with title"""
-    print(f"\n{'='*60}")
-    print(f"  {title}")
-    print('='*60)
+    _p(f"\n{'='*60}")
+    _p(f"  {title}")
+    _p('='*60)
 
 
 def print_component_status(components):
     """Print component status in a nice table format"""
-    print(f"{'ID':<12} {'Name':<20} {'Type':<8} {'Util%':<6} {'Temp°C':<7} {'Power W':<8} {'Status'}")
-    print('-' * 70)
-    
-    for comp in components:
-        print(f"{comp.id:<12} {comp.name:<20} {comp.component_type.value:<8} "
-              f"{comp.utilization:>5.1f} {comp.temperature:>6.1f} "
-              f"{comp.power_draw:>7.1f} {comp.status.value}")
+    rows = [f"{comp.id:<12} {comp.name:<20} {comp.component_type.value:<8} "
+            f"{comp.utilization:>5.1f} {comp.temperature:>6.1f} "
+            f"{comp.power_draw:>7.1f} {comp.status.value}" for comp in components]
+    _p("\n".join((_COMP_HEADER, *rows)))  # one write for the whole table
 
 
 def print_link_status(links):
     """Print link status in a nice table format"""
-    print(f"{'ID':<15} {'Source':<8} {'Target':<8} {'Type':<6} {'Util%':<6} {'Lat ms':<7} {'BW Gbps':<8} {'Err%':<6}")
-    print('-' * 75)
-    
-    for link in links:
-        print(f"{link.id:<15} {link.source_id:<8} {link.target_id:<8} "
-              f"{link.link_type.value:<6} {link.utilization:>5.1f} "
-              f"{link.latency_ms:>6.3f} {link.bandwidth_gbps:>7.1f} {link.error_rate:>5.2f}")
+    rows = [f"{link.id:<15} {link.source_id:<8} {link.target_id:<8} "
+            f"{link.link_type.value:<6} {link.utilization:>5.1f} "
+            f"{link.latency_ms:>6.3f} {link.bandwidth_gbps:>7.1f} {link.error_rate:>5.2f}" for link in links]
+    _p("\n".join((_LINK_HEADER, *rows)))
 
 
 def print_system_metrics(metrics):
     """Print system-wide metrics"""
-    print("System Metrics:")
-    for key, value in metrics.items():
-        if isinstance(value, float):
-            print(f"  {key}: {value:.2f}")
-        else:
-            print(f"  {key}: {value}")
+    rows = [f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}"
+            for key, value in metrics.items()]
+    _p("\n".join(["System Metrics:", *rows]))
 
 
-def test_basic_simulation():
+def make_simulator():
+    """Seeded simulator shared by the tests"""
+    from providers.sim import HardwareSimulator  # pulls in the Numba kernels - import on use
+    
+    return HardwareSimulator(seed=42)
+
+
+def test_basic_simulation(sim=None):
     """Test basic simulation functionality"""
     print_separator("SynapseNet Hardware Simulation Test")
     
     # Initialize simulator
-    print("Initializing hardware simulator...")
-    sim = HardwareSimulator(seed=42)
+    _p("Initializing hardware simulator...")
+    if sim is None:  # collected on its own (e.g. by pytest) rather than from main()
+        sim = make_simulator()
     
     # Show initial topology
     print_separator("Initial Topology")
     topology = sim.get_topology_summary()
-    print(f"Components: {len(topology['components'])}")
-    print(f"Links: {len(topology['links'])}")
+    components, links = topology['components'], topology['links']
+    _p(f"Components: {len(components)}")
+    _p(f"Links: {len(links)}")
     
-    print("\nComponent Details:")
-    for comp_id, comp_info in topology['components'].items():
-        print(f"  {comp_id}: {comp_info['name']} ({comp_info['type']})")
+    _p("\n".join(["\nComponent Details:"] + [
+        f"  {comp_id}: {comp_info['name']} ({comp_info['type']})"
+        for comp_id, comp_info in components.items()]))
     
-    print("\nLink Details:")
-    for link_id, link_info in topology['links'].items():
-        print(f"  {link_id}: {link_info['source']} -> {link_info['target']} ({link_info['type']})")
+    _p("\n".join(["\nLink Details:"] + [
+        f"  {link_id}: {link_info['source']} -> {link_info['target']} ({link_info['type']})"
+        for link_id, link_info in links.items()]))
     
     # Run simulation for a few steps
     print_separator("Running Simulation (5 steps)")
     
     for step in range(5):
-        print(f"\n--- Step {step + 1} ---")
+        _p(f"\n--- Step {step + 1} ---")
         telemetry = sim.step()
         
         print_component_status(telemetry.components)
-        print()
+        _p()
         print_link_status(telemetry.links)
-        print()
+        _p()
         print_system_metrics(telemetry.system_metrics)
         
         # Small delay to make it more readable
         time.sleep(0.5)
-    
-    return sim
 
 
-def test_chaos_injection(sim):
+def test_chaos_injection(sim=None):
     """Test chaos injection functionality"""
+    if sim is None:  # collected on its own (e.g. by pytest) rather than from main()
+        sim = make_simulator()
     print_separator("Testing Chaos Injection")
     
     # Get baseline
     baseline = sim.step()
-    print("Baseline metrics:")
+    _p("Baseline metrics:")
     print_system_metrics(baseline.system_metrics)
     
     # Inject chaos into CPU
-    print(f"\nInjecting overload chaos into CPU...")
+    _p(f"\nInjecting overload chaos into CPU...")
     sim.inject_chaos("cpu_0", "overload")
     
     after_chaos = sim.step()
-    print("\nAfter CPU overload:")
+    _p("\nAfter CPU overload:")
     print_component_status(after_chaos.components)
-    print()
+    _p()
     print_system_metrics(after_chaos.system_metrics)
     
     # Inject chaos into a link
-    print(f"\nInjecting latency spike into CPU-Switch link...")
+    _p(f"\nInjecting latency spike into CPU-Switch link...")
     sim.inject_chaos("cpu_switch_link", "latency_spike")
     
     after_link_chaos = sim.step()
-    print("\nAfter link latency spike:")
+    _p("\nAfter link latency spike:")
     print_link_status(after_link_chaos.links)
-    print()
+    _p()
     print_system_metrics(after_link_chaos.system_metrics)
 
 
-def test_json_serialization(sim):
+def test_json_serialization(sim=None):
     """Test that our data can be serialized to JSON (important for API)"""
+    if sim is None:
+        sim = make_simulator()
     print_separator("Testing JSON Serialization")
     
     telemetry = sim.step()
     
-    try:
-        # Convert to dict and then to JSON
-        telemetry_dict = telemetry.model_dump()
-        json_str = json.dumps(telemetry_dict, indent=2)
-        
-        print("✅ JSON serialization successful!")
-        print(f"JSON size: {len(json_str)} characters")
-        
-        # Show a sample of the JSON
-        lines = json_str.split('\n')
-        print("\nFirst 10 lines of JSON:")
-        for line in lines[:10]:
-            print(line)
-        print("...")
-        
-        # Test deserialization
-        from schemas import TelemetryFrame
-        restored = TelemetryFrame.model_validate(telemetry_dict)
-        print("✅ JSON deserialization successful!")
-        
-    except Exception as e:
-        print(f"❌ JSON serialization failed: {e}")
-        return False
+    # Serialize straight to JSON - no intermediate dict
+    json_str = telemetry.model_dump_json(indent=2)
+    
+    _p("✅ JSON serialization successful!")
+    _p(f"JSON size: {len(json_str)} characters")
+    
+    # Show a sample of the JSON
+    lines = json_str.split('\n')
+    _p("\nFirst 10 lines of JSON:")
+    for line in lines[:10]:
+        _p(line)
+    _p("...")
     
-    return True
+    # Test deserialization - the round trip must reproduce the frame exactly
+    from schemas import TelemetryFrame
+    restored = TelemetryFrame.model_validate_json(json_str)
+    assert len(restored.components) == len(telemetry.components)
+    assert len(restored.links) == len(telemetry.links)
+    assert restored == telemetry, "JSON round trip changed the telemetry frame"
+    _p("✅ JSON deserialization successful!")
 
 
 def main():
     """Main test function"""
-    print("🚀 Starting SynapseNet Backend Tests")
+    _p("🚀 Starting SynapseNet Backend Tests")
     
     try:
         # Test basic simulation
-        sim = test_basic_simulation()
+        sim = make_simulator()
+        test_basic_simulation(sim)
         
         # Test chaos injection
         test_chaos_injection(sim)
@@ -174,17 +181,17 @@ def main():
         test_json_serialization(sim)
         
         print_separator("All Tests Completed Successfully! ✅")
-        print("\nThe hardware simulation is working correctly.")
-        print("You can now:")
-        print("1. Run this script again to see different random values")
-        print("2. Modify the topology in src/providers/sim.py")
-        print("3. Add more chaos injection types")
-        print("4. Build the FastAPI web service on top of this")
+        _p("\nThe hardware simulation is working correctly.")
+        _p("You can now:")
+        _p("1. Run this script again to see different random values")
+        _p("2. Modify the topology in src/providers/sim.py")
+        _p("3. Add more chaos injection types")
+        _p("4. Build the FastAPI web service on top of this")
         
     except Exception as e:
-        print(f"\n❌ Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
+        sys.stderr.write(f"\n❌ Test failed with error: {''.join(traceback.format_exception_only(e))}")
+        if os.environ.get("NODECOMM_TRACE"):  # set for the full traceback
+            raise
         return 1
     
     return 0
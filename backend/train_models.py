@@ -9,18 +9,115 @@ import pandas as pd
 import pickle
 import argparse
 import joblib
+from joblib import parallel_config
+import hashlib
 import os
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-import matplotlib.pyplot as plt
+import warnings
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional - use the vectorized NumPy slopes
+    NUMBA_AVAILABLE = False
+
+try:
+    import psutil
+except ImportError:  # psutil is optional - fall back to the logical CPU count
+    psutil = None
+
+
+def _default_n_jobs():
+    """
+    Worker count for forest fitting: NODECOMM_NJOBS, else one per physical core.
+    Prefer this over a global OMP_NUM_THREADS, which would also throttle the
+    boosting and Numba threads outside the parallel sections.
+    """
+    env = os.environ.get("NODECOMM_NJOBS")
+    if env:
+        return int(env)
+    # One worker per SMT sibling oversubscribes the split evaluation
+    physical = psutil.cpu_count(logical=False) if psutil is not None else None
+    return physical or os.cpu_count() or 1
+
+
+N_JOBS = _default_n_jobs()
+
+try:
+    import lz4  # noqa: F401 - only needed by joblib's lz4 compressor
+    MODEL_COMPRESS = ('lz4', 3)
+except ImportError:  # lz4 is optional - zlib ships with Python
+    MODEL_COMPRESS = ('zlib', 3)
+
+
+MODEL_BUNDLE = "models.joblib"
+
+
+def describe_model_size(model):
+    """'60 trees' for a forest, '85 boosting iterations' for gradient boosting"""
+    if hasattr(model, 'estimators_'):
+        return f"{len(model.estimators_)} trees"
+    return f"{model.n_iter_} boosting iterations"
+
+
+def dump_artifact(obj, path):
+    """joblib.dump with compression; joblib.load detects it, so loaders need no changes"""
+    joblib.dump(obj, path, compress=MODEL_COMPRESS, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _window_slopes_numpy(values, window):
+    """Least-squares slope of every column over each trailing window (vectorized)"""
+    x = np.arange(window, dtype=np.float64)
+    x -= x.mean()
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    return (windows @ x) / (x @ x)
+
+
+def _fill_features_numpy(values, trend_idx, window, out):
+    """Vectorized fill_features"""
+    n_current = values.shape[1]
+    out[:, :n_current] = values[window - 1:]
+    out[:, n_current:] = _window_slopes_numpy(values[:, trend_idx], window)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def fill_features(values, trend_idx, window, out):
+        """
+        Write one feature row per trailing window of `values` into `out`.
+        
+        Row i of out holds the raw values of row i + window - 1 followed by
+        the least-squares slope of each trend_idx column over rows
+        i..i + window - 1. With x fixed at 0..n-1 the slope has the closed
+        form sum((x - mean_x) * y) / sum((x - mean_x)^2).
+        """
+        n_out = out.shape[0]
+        n_current = values.shape[1]
+        x_mean = (window - 1) / 2.0
+        denom = 0.0
+        for k in range(window):
+            denom += (k - x_mean) * (k - x_mean)
+        
+        # One fused sweep - each window stays in cache, no per-column temporaries
+        for i in prange(n_out):
+            last = i + window - 1
+            for j in range(n_current):
+                out[i, j] = values[last, j]
+            for t in range(trend_idx.shape[0]):
+                col = trend_idx[t]
+                sxy = 0.0
+                for k in range(window):
+                    sxy += (k - x_mean) * values[i + k, col]
+                out[i, n_current + t] = sxy / denom
+else:
+    fill_features = _fill_features_numpy
 
 
 class FailurePredictionTrainer:
     """Train ML models for different types of hardware failures"""
     
-    def __init__(self):
+    def __init__(self, algo="rf"):
+        # "rf" = RandomForestClassifier, "hgb" = HistGradientBoostingClassifier
+        self.algo = algo
         self.models = {}
         self.scalers = {}
         self.feature_names = [
@@ -35,81 +132,159 @@ class FailurePredictionTrainer:
         ]
         
         self.all_features = self.feature_names + self.trend_features
+        self.trend_index = np.array([self.feature_names.index(c) for c in self.TREND_COLUMNS])
+        
+        # Every dataset column extract_features reads
+        self.dataset_columns = self.feature_names + ['timestamp', 'failure_in_10s', 'failure_type']
+    
+    # Source column for each trend feature, in trend_features order
+    TREND_COLUMNS = [
+        'cpu_util', 'cpu_temp', 'gpu_util', 'gpu_temp',
+        'network_latency', 'network_util', 'power_draw'
+    ]
+    TREND_WINDOW = 5
+    # Part of the feature cache key - bump whenever extract_features computes anything differently
+    FEATURE_VERSION = 1
+    # Tree splits are stored as float32 by sklearn - float64 input only buys an internal copy
+    FEATURE_DTYPE = np.float32
+    EXTRACT_CHUNK_ROWS = 100_000
+    
+    # Forests grow in blocks of TREE_BLOCK trees until the out-of-bag accuracy
+    # gains less than OOB_TOLERANCE over a block, or MAX_TREES is reached
+    TREE_BLOCK = 20
+    MAX_TREES = 100
+    OOB_TOLERANCE = 1e-3
+    
+    def feature_rows(self, df):
+        """Rows extract_features produces for df"""
+        # Need at least 5 samples for trend calculation - rows before that are dropped
+        return max(len(df) - self.TREND_WINDOW, 0)
     
-    def extract_features(self, df):
-        """Extract features including time-series trends"""
+    def extract_features(self, df, out=None):
+        """
+        Extract features including time-series trends.
+        The matrix is filled EXTRACT_CHUNK_ROWS rows at a time, so temporaries
+        stay chunk-sized; pass `out` (e.g. a np.memmap from create_feature_cache)
+        to write it straight to disk instead of allocating it in memory.
+        """
         print("🔧 Extracting features...")
         
-        # Sort by timestamp
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        
-        features = []
-        labels = []
-        failure_types = []
-        
-        # Need at least 5 samples for trend calculation
-        for i in range(5, len(df)):
-            # Current state features
-            current = df.iloc[i]
-            feature_vector = [
-                current['cpu_util'], current['cpu_temp'], current['gpu_util'],
-                current['gpu_temp'], current['memory_util'], current['network_latency'],
-                current['network_bandwidth'], current['network_util'], current['power_draw']
-            ]
-            
-            # Trend features (slope over last 5 samples)
-            window = df.iloc[i-4:i+1]
-            
-            # Calculate trends
-            cpu_util_trend = np.polyfit(range(5), window['cpu_util'], 1)[0]
-            cpu_temp_trend = np.polyfit(range(5), window['cpu_temp'], 1)[0]
-            gpu_util_trend = np.polyfit(range(5), window['gpu_util'], 1)[0]
-            gpu_temp_trend = np.polyfit(range(5), window['gpu_temp'], 1)[0]
-            network_latency_trend = np.polyfit(range(5), window['network_latency'], 1)[0]
-            network_util_trend = np.polyfit(range(5), window['network_util'], 1)[0]
-            power_trend = np.polyfit(range(5), window['power_draw'], 1)[0]
-            
-            trend_vector = [
-                cpu_util_trend, cpu_temp_trend, gpu_util_trend, gpu_temp_trend,
-                network_latency_trend, network_util_trend, power_trend
-            ]
-            
-            feature_vector.extend(trend_vector)
+        # Trends assume time order - load_dataset sorts once, so don't pay for it per call
+        if not df['timestamp'].is_monotonic_increasing:
+            raise ValueError("Dataset must be sorted by timestamp (load_dataset does this)")
+        
+        start = self.TREND_WINDOW
+        n_rows = self.feature_rows(df)
+        shape = (n_rows, len(self.all_features))
+        if out is None:
+            features = np.empty(shape, dtype=self.FEATURE_DTYPE)
+        elif out.shape != shape:
+            raise ValueError(f"out has shape {out.shape}, expected {shape}")
+        else:
+            features = out
+        
+        for lo in range(0, n_rows, self.EXTRACT_CHUNK_ROWS):
+            hi = min(lo + self.EXTRACT_CHUNK_ROWS, n_rows)
+            # Output rows lo..hi are df rows lo+5..hi+5; their trend windows reach back 4 rows
+            values = np.ascontiguousarray(
+                df.iloc[lo + 1:hi + start][self.feature_names].to_numpy(dtype=np.float64)
+            )
             
-            features.append(feature_vector)
-            labels.append(current['failure_in_10s'])
-            failure_types.append(current['failure_type'])
+            # Current state features plus trend features (slope over last 5 samples) in one
+            # pass (Numba kernel, or NumPy when Numba is missing). Slopes are fitted in
+            # float64 and only the result is narrowed
+            fill_features(values, self.trend_index, self.TREND_WINDOW, np.asarray(features[lo:hi]))
         
-        return np.array(features), np.array(labels), failure_types
+        labels = df['failure_in_10s'].to_numpy()[start:]
+        failure_types = df['failure_type'].to_numpy()[start:].tolist()
+        
+        return features, labels, failure_types
+    
+    def make_model(self, **forest_params):
+        """Untrained classifier for self.algo; forest_params only apply to the Random Forest"""
+        if self.algo == "hgb":
+            # Bins every feature into <= 255 uint8 levels - histogram scans instead of sorted splits
+            from sklearn.ensemble import HistGradientBoostingClassifier
+            return HistGradientBoostingClassifier(
+                max_iter=200,
+                max_depth=8,
+                early_stopping=True,
+                n_iter_no_change=10,
+                random_state=42
+            )
+        
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(
+            n_estimators=self.TREE_BLOCK,
+            random_state=42,
+            n_jobs=N_JOBS,
+            warm_start=True,
+            oob_score=True,
+            **forest_params
+        )
+    
+    def fit_model(self, model, X_train, y_train):
+        """Fit a model from make_model"""
+        if self.algo == "hgb":
+            model.fit(X_train, y_train)
+            print(f"   Boosting iterations: {model.n_iter_}")
+            return model
+        return self.fit_forest(model, X_train, y_train)
+    
+    def fit_forest(self, model, X_train, y_train):
+        """Fit a warm-start forest block by block, stopping once the OOB accuracy plateaus"""
+        with warnings.catch_warnings():
+            # The first blocks leave a few samples without OOB votes - harmless here
+            warnings.filterwarnings("ignore", message="Some inputs do not have OOB scores")
+            model.set_params(n_estimators=self.TREE_BLOCK)
+            model.fit(X_train, y_train)
+            for n_trees in range(2 * self.TREE_BLOCK, self.MAX_TREES + 1, self.TREE_BLOCK):
+                prev_oob = model.oob_score_
+                model.set_params(n_estimators=n_trees)
+                model.fit(X_train, y_train)
+                if model.oob_score_ - prev_oob < self.OOB_TOLERANCE:
+                    break
+        
+        print(f"   Trees: {len(model.estimators_)} (OOB accuracy {model.oob_score_:.3f})")
+        return model
+    
+    def print_top_features(self, model, k=5):
+        """Print the k most important features, partitioning rather than sorting all of them"""
+        importances = getattr(model, 'feature_importances_', None)
+        if importances is None:  # gradient boosting has no impurity importances
+            return
+        k = min(k, len(importances))
+        top = np.argpartition(importances, -k)[-k:]
+        top = top[np.argsort(-importances[top])]
+        
+        print(f"   Top {k} features:")
+        for i in top:
+            print(f"     {self.all_features[i]}: {importances[i]:.3f}")
     
     def train_binary_classifier(self, X, y, model_name="failure_predictor"):
         """Train binary classifier for failure prediction"""
+        # sklearn is imported here so cache-only and --convert-to-parquet runs skip its import cost
+        from sklearn.base import clone
+        from sklearn.metrics import accuracy_score
+        from sklearn.model_selection import train_test_split, cross_val_score
+        
         print(f"🎯 Training {model_name}...")
         
+        X = np.asarray(X, dtype=self.FEATURE_DTYPE)
+        
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
         )
         
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        # Train Random Forest
-        model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1
-        )
+        # No feature scaling - tree splits are per-feature thresholds, so
+        # tree ensembles are scale-invariant
         
-        model.fit(X_train_scaled, y_train)
+        model = self.make_model(max_depth=10, min_samples_split=5, min_samples_leaf=2)
+        self.fit_model(model, X_train, y_train)
         
         # Evaluate
-        y_pred = model.predict(X_test_scaled)
+        y_pred = model.predict(X_test)
         accuracy = accuracy_score(y_test, y_pred)
         
         print(f"✅ {model_name} trained!")
@@ -119,42 +294,47 @@ class FailurePredictionTrainer:
         print(f"   Positive samples: {sum(y_train)} train, {sum(y_test)} test")
         
         # Cross-validation
-        cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=5)
+        # Parallelize across folds with serial forests - five independent fits
+        # keep the cores busier than one forest's tree-level parallelism
+        cv_folds = 5
+        if self.algo == "hgb":
+            # Boosting threads internally via OpenMP - run the folds one at a time
+            cv_model, cv_jobs = clone(model), 1
+        else:
+            # The clone keeps the settled tree count but skips warm start and OOB bookkeeping
+            cv_model = clone(model).set_params(n_jobs=1, warm_start=False, oob_score=False)
+            cv_jobs = min(cv_folds, N_JOBS)
+        # Cap BLAS/OpenMP pools inside each fold worker at one thread so the fold
+        # processes don't each open a pool sized to every core
+        with parallel_config(backend='loky', inner_max_num_threads=1):
+            cv_scores = cross_val_score(cv_model, X_train, y_train, cv=cv_folds, n_jobs=cv_jobs)
         print(f"   CV Accuracy: {cv_scores.mean():.3f} (+/- {cv_scores.std() * 2:.3f})")
         
-        # Feature importance
-        feature_importance = list(zip(self.all_features, model.feature_importances_))
-        feature_importance.sort(key=lambda x: x[1], reverse=True)
+        self.print_top_features(model)
         
-        print(f"   Top 5 features:")
-        for feature, importance in feature_importance[:5]:
-            print(f"     {feature}: {importance:.3f}")
-        
-        # Store model and scaler
+        # Store model
         self.models[model_name] = model
-        self.scalers[model_name] = scaler
         
-        return model, scaler, accuracy
+        return model, None, accuracy
     
-    def train_multiclass_classifier(self, X, y, failure_types, model_name="failure_type_predictor"):
-        """Train multiclass classifier for failure type prediction"""
+    def train_multiclass_classifier(self, X_failures, failure_type_labels, model_name="failure_type_predictor"):
+        """Train multiclass classifier for failure type prediction on the failure samples only"""
+        from sklearn.metrics import accuracy_score
+        from sklearn.model_selection import train_test_split
+        
         print(f"🎯 Training {model_name}...")
         
-        # Only train on failure samples
-        failure_mask = np.array(y) == True
-        X_failures = X[failure_mask]
-        failure_type_labels = np.array(failure_types)[failure_mask]
+        X_failures = np.asarray(X_failures, dtype=self.FEATURE_DTYPE)
+        failure_type_labels = np.asarray(failure_type_labels)
         
         if len(X_failures) == 0:
             print("❌ No failure samples found!")
             return None, None, 0
         
-        # Map failure types to numbers
-        unique_types = list(set(failure_type_labels))
-        type_to_num = {t: i for i, t in enumerate(unique_types)}
-        y_types = [type_to_num[t] for t in failure_type_labels]
+        # Map failure types to numbers - sorted, so the saved mapping is stable across runs
+        unique_types, y_types = np.unique(failure_type_labels, return_inverse=True)
         
-        print(f"   Failure types: {unique_types}")
+        print(f"   Failure types: {unique_types.tolist()}")
         print(f"   Samples per type: {pd.Series(failure_type_labels).value_counts().to_dict()}")
         
         # Split data
@@ -162,25 +342,14 @@ class FailurePredictionTrainer:
             X_failures, y_types, test_size=0.2, random_state=42, stratify=y_types
         )
         
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        # Train Random Forest
-        model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=8,
-            min_samples_split=3,
-            min_samples_leaf=1,
-            random_state=42,
-            n_jobs=-1
-        )
+        # No feature scaling - tree splits are per-feature thresholds, so
+        # tree ensembles are scale-invariant
         
-        model.fit(X_train_scaled, y_train)
+        model = self.make_model(max_depth=8, min_samples_split=3, min_samples_leaf=1)
+        self.fit_model(model, X_train, y_train)
         
         # Evaluate
-        y_pred = model.predict(X_test_scaled)
+        y_pred = model.predict(X_test)
         accuracy = accuracy_score(y_test, y_pred)
         
         print(f"✅ {model_name} trained!")
@@ -188,43 +357,71 @@ class FailurePredictionTrainer:
         print(f"   Training samples: {len(X_train)}")
         print(f"   Test samples: {len(X_test)}")
         
-        # Store model, scaler, and type mapping
+        self.print_top_features(model)
+        
+        # Store model and type mapping
         self.models[model_name] = model
-        self.scalers[model_name] = scaler
-        self.models[f"{model_name}_type_mapping"] = {i: t for t, i in type_to_num.items()}
+        self.models[f"{model_name}_type_mapping"] = {i: str(t) for i, t in enumerate(unique_types)}
         
-        return model, scaler, accuracy
+        return model, None, accuracy
     
-    def save_models(self, output_dir):
-        """Save trained models and scalers"""
+    def save_models(self, output_dir, legacy_layout=False):
+        """Save trained models, scalers, type mapping and feature names as one bundle"""
         os.makedirs(output_dir, exist_ok=True)
         
         print(f"💾 Saving models to {output_dir}...")
         
+        bundle = {
+            'models': {name: model for name, model in self.models.items()
+                       if not name.endswith('_type_mapping')},
+            'scalers': dict(self.scalers),
+            'feature_names': self.all_features,
+            'type_mapping': self.models.get('failure_type_predictor_type_mapping', {}),
+        }
+        
+        # Write beside the target and rename, so a loader never sees a half-written bundle
+        bundle_path = os.path.join(output_dir, MODEL_BUNDLE)
+        tmp_path = bundle_path + ".tmp"
+        dump_artifact(bundle, tmp_path)
+        os.replace(tmp_path, bundle_path)
+        print(f"   Saved {', '.join(bundle['models'])} to {bundle_path}")
+        
+        if legacy_layout:
+            self._save_split_files(output_dir)
+        
+        print("✅ All models saved!")
+    
+    def _save_split_files(self, output_dir):
+        """One file per artifact, for consumers that predate the bundle"""
         # Save each model and scaler
         for name, model in self.models.items():
             if not name.endswith('_type_mapping'):
                 model_path = os.path.join(output_dir, f"{name}.pkl")
-                joblib.dump(model, model_path)
+                dump_artifact(model, model_path)
                 print(f"   Saved {name} to {model_path}")
         
-        for name, scaler in self.scalers.items():
+        for name in self.models:
+            if name.endswith('_type_mapping'):
+                continue
             scaler_path = os.path.join(output_dir, f"{name}_scaler.pkl")
-            joblib.dump(scaler, scaler_path)
-            print(f"   Saved {name}_scaler to {scaler_path}")
+            if name in self.scalers:
+                dump_artifact(self.scalers[name], scaler_path)
+                print(f"   Saved {name}_scaler to {scaler_path}")
+            elif os.path.exists(scaler_path):
+                # Left over from an older run - the new model expects unscaled features
+                os.remove(scaler_path)
+                print(f"   Removed stale {name}_scaler at {scaler_path}")
         
         # Save type mapping
         if 'failure_type_predictor_type_mapping' in self.models:
             mapping_path = os.path.join(output_dir, "failure_type_mapping.pkl")
-            joblib.dump(self.models['failure_type_predictor_type_mapping'], mapping_path)
+            dump_artifact(self.models['failure_type_predictor_type_mapping'], mapping_path)
             print(f"   Saved type mapping to {mapping_path}")
         
         # Save feature names
         feature_path = os.path.join(output_dir, "feature_names.pkl")
-        joblib.dump(self.all_features, feature_path)
+        dump_artifact(self.all_features, feature_path)
         print(f"   Saved feature names to {feature_path}")
-        
-        print("✅ All models saved!")
     
     def create_model_summary(self, output_dir):
         """Create a summary of trained models"""
@@ -237,7 +434,7 @@ class FailurePredictionTrainer:
             f.write("Models trained:\n")
             for name in self.models:
                 if not name.endswith('_type_mapping'):
-                    f.write(f"  - {name}\n")
+                    f.write(f"  - {name} ({describe_model_size(self.models[name])})\n")
             
             f.write(f"\nFeatures used ({len(self.all_features)}):\n")
             for feature in self.all_features:
@@ -251,12 +448,28 @@ class FailurePredictionTrainer:
         print(f"📋 Model summary saved to {summary_path}")
 
 
-def load_dataset(dataset_path):
-    """Load the training dataset"""
+def load_dataset(dataset_path, columns=None):
+    """
+    Load the training dataset.
+    Parquet and Feather files are read column-selectively, so only `columns`
+    are deserialized; anything else is treated as a pickled DataFrame.
+    """
     print(f"📂 Loading dataset from {dataset_path}...")
     
-    with open(dataset_path, 'rb') as f:
-        df = pickle.load(f)
+    suffix = os.path.splitext(dataset_path)[1].lower()
+    if suffix == '.parquet':
+        df = pd.read_parquet(dataset_path, columns=columns)
+    elif suffix == '.feather':
+        df = pd.read_feather(dataset_path, columns=columns)
+    else:
+        with open(dataset_path, 'rb') as f:
+            df = pickle.load(f)
+        if columns is not None:
+            df = df[columns]
+    
+    # Sort by timestamp - usually already in order, which skips the sort
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
     
     print(f"✅ Dataset loaded!")
     print(f"   Total samples: {len(df)}")
@@ -267,21 +480,96 @@ def load_dataset(dataset_path):
     return df
 
 
+def convert_to_parquet(dataset_path):
+    """Write a pickled dataset next to itself as Parquet (needs pyarrow) and return the new path"""
+    with open(dataset_path, 'rb') as f:
+        df = pickle.load(f)
+    
+    parquet_path = os.path.splitext(dataset_path)[0] + '.parquet'
+    df.to_parquet(parquet_path, index=False)
+    print(f"💾 Converted {dataset_path} to {parquet_path} ({len(df)} rows)")
+    return parquet_path
+
+
+FEATURE_CACHE_DIR = ".cache"
+
+
+def _feature_cache_stem(dataset_path, trainer):
+    """Cache path (without extension) for this dataset version and feature layout"""
+    stat = os.stat(dataset_path)
+    key_src = (f"{os.path.abspath(dataset_path)}:{stat.st_mtime_ns}:{stat.st_size}:"
+               f"{','.join(trainer.all_features)}:{np.dtype(trainer.FEATURE_DTYPE).name}:"
+               f"w{trainer.TREND_WINDOW}:v{trainer.FEATURE_VERSION}")
+    key = hashlib.sha1(key_src.encode()).hexdigest()[:16]
+    return os.path.join(FEATURE_CACHE_DIR, f"features_{key}")
+
+
+def load_cached_features(dataset_path, trainer):
+    """Return (X, y, failure_types) from the feature cache, or None on a miss; X is memory-mapped"""
+    stem = _feature_cache_stem(dataset_path, trainer)
+    # The labels file is written last, so its presence means X is complete
+    if not os.path.exists(stem + ".npz"):
+        return None
+    
+    X = np.load(stem + ".npy", mmap_mode='r')
+    with np.load(stem + ".npz") as cached:
+        y, failure_types = cached['y'], cached['failure_types'].tolist()
+    print(f"⚡ Loaded cached features from {stem}.npy")
+    return X, y, failure_types
+
+
+def create_feature_cache(dataset_path, trainer, n_rows):
+    """Memory-mapped feature matrix in the cache, for extract_features(out=...) to fill"""
+    os.makedirs(FEATURE_CACHE_DIR, exist_ok=True)
+    stem = _feature_cache_stem(dataset_path, trainer)
+    if os.path.exists(stem + ".npz"):
+        os.remove(stem + ".npz")  # invalidate until the new labels land
+    return np.lib.format.open_memmap(stem + ".npy", mode='w+', dtype=trainer.FEATURE_DTYPE,
+                                     shape=(n_rows, len(trainer.all_features)))
+
+
+def save_cached_features(dataset_path, trainer, X, y, failure_types):
+    """Store extracted features so the next run on the same dataset skips extraction"""
+    os.makedirs(FEATURE_CACHE_DIR, exist_ok=True)
+    stem = _feature_cache_stem(dataset_path, trainer)
+    if isinstance(X, np.memmap) and os.path.abspath(X.filename) == os.path.abspath(stem + ".npy"):
+        X.flush()  # extracted in place by create_feature_cache
+    else:
+        np.save(stem + ".npy", X)
+    np.savez(stem + ".npz", y=y, failure_types=np.array(failure_types))
+    print(f"💾 Cached features to {stem}.npy")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Train ML models for hardware failure prediction')
     parser.add_argument('--dataset', type=str, required=True, help='Path to training dataset')
     parser.add_argument('--output', type=str, default='models', help='Output directory for trained models')
+    parser.add_argument('--no-cache', action='store_true', help='Re-extract features even if a cached copy exists')
+    parser.add_argument('--algo', choices=['rf', 'hgb'], default='rf',
+                        help='Model family: Random Forest or histogram gradient boosting')
+    parser.add_argument('--legacy-layout', action='store_true', help='Also write one .pkl file per model artifact')
+    parser.add_argument('--convert-to-parquet', action='store_true',
+                        help='Convert the pickled dataset to Parquet beside it and exit')
     
     args = parser.parse_args()
     
-    # Load dataset
-    df = load_dataset(args.dataset)
+    if args.convert_to_parquet:
+        convert_to_parquet(args.dataset)
+        return
     
     # Initialize trainer
-    trainer = FailurePredictionTrainer()
+    trainer = FailurePredictionTrainer(algo=args.algo)
     
-    # Extract features
-    X, y, failure_types = trainer.extract_features(df)
+    # Extract features (cached per dataset version - reruns skip loading and extraction)
+    features = None if args.no_cache else load_cached_features(args.dataset, trainer)
+    if features is None:
+        df = load_dataset(args.dataset, columns=trainer.dataset_columns)
+        # With caching on, the matrix is extracted straight into the memory-mapped cache file
+        out = None if args.no_cache else create_feature_cache(args.dataset, trainer, trainer.feature_rows(df))
+        features = trainer.extract_features(df, out=out)
+        if not args.no_cache:
+            save_cached_features(args.dataset, trainer, *features)
+    X, y, failure_types = features
     
     print(f"\n🎯 Training ML models...")
     print(f"   Feature matrix shape: {X.shape}")
@@ -290,11 +578,14 @@ def main():
     # Train binary classifier (will failure occur?)
     binary_model, binary_scaler, binary_acc = trainer.train_binary_classifier(X, y)
     
-    # Train multiclass classifier (what type of failure?)
-    multi_model, multi_scaler, multi_acc = trainer.train_multiclass_classifier(X, y, failure_types)
+    # Train multiclass classifier (what type of failure?) on the failure rows, selected once
+    failure_mask = np.asarray(y, dtype=bool)
+    multi_model, multi_scaler, multi_acc = trainer.train_multiclass_classifier(
+        X[failure_mask], np.asarray(failure_types)[failure_mask]
+    )
     
     # Save models
-    trainer.save_models(args.output)
+    trainer.save_models(args.output, legacy_layout=args.legacy_layout)
     trainer.create_model_summary(args.output)
     
     print(f"\n🎉 Training complete!")